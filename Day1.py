@@ -17,9 +17,12 @@ def get_input(input_file: str='Inputs/Day1_Inputs.txt') -> list:
 
     """
     with open(input_file) as f:
-        lines = [l.strip() for l in f.readlines()]
+        lines = f.read().splitlines()
     return lines
 
+# String of all single byte characters other than digits, to strip from the ends of lines
+NON_DIGITS = ''.join(c for c in map(chr, range(256)) if c not in '0123456789')
+
 def Day1_Part1(input_file: str='Inputs/Day1_Inputs.txt') -> int:
     """
     Computes the sum of all the calibration values in a document given in an input file.
@@ -40,13 +43,19 @@ def Day1_Part1(input_file: str='Inputs/Day1_Inputs.txt') -> int:
     """
     # Parse input file
     lines = get_input(input_file)
-    # Use regex to extract all digits on each line
-    lines = [''.join(re.findall('\d+', l)) for l in lines]
-    # Combine the first and last digits on each line, and sum the corresponding values
-    total = sum(int(l[0] + l[-1]) for l in lines)
+    # Strip everything other than digits from both ends of each line, leaving the first and last
+    # digits at either end, then combine them and sum the corresponding values
+    total = sum(int((digits := l.strip(NON_DIGITS))[0] + digits[-1]) for l in lines)
 
     return total
 
+# Dict to convert spelled out numbers and digits to values
+DIGIT_VALUES = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+                'six': 6, 'seven': 7, 'eight': 8, 'nine': 9} | {str(n): n for n in range(10)}
+
+# Regex pattern matching all spelled out numbers and digits, allowing for overlapping matches
+DIGIT_PATTERN = re.compile(f"(?=({'|'.join(DIGIT_VALUES)}))")
+
 def Day1_Part2(input_file: str='Inputs/Day1_Inputs.txt') -> int:
     """
     Computes the sum of all the calibration values in a document given in an input file.
@@ -69,28 +78,9 @@ def Day1_Part2(input_file: str='Inputs/Day1_Inputs.txt') -> int:
     # Parse input file
     lines = get_input(input_file)
 
-    # Dict to convert spelled out numbers to values
-    rep = {'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
-           'six': '6', 'seven': '7', 'eight': '8', 'nine': '9'}
-
-    # Dict to convert reversed spelled out numbers to values
-    rev_rep = {s[::-1]: n for s, n in rep.items()}
-
-    # Create regex patterns to sub in numbers for corresponding words in each dict
-    pattern = re.compile("|".join(rep.keys()))
-    rev_pattern = re.compile("|".join(rev_rep.keys()))
-
-    # Sub in numbers for corresponding words in lines and reversed lines
-    sub_lines = [pattern.sub(lambda m: rep[re.escape(m.group(0))], l)
-             for l in lines]
-    sub_rev_lines = [rev_pattern.sub(lambda m: rev_rep[re.escape(m.group(0))], l[::-1])
-             for l in lines]
-
-    # Extract all digits in both cases using regex
-    lines = [''.join(re.findall('\d+', l)) for l in sub_lines]
-    rev_lines = [''.join(re.findall('\d+', l)) for l in sub_rev_lines]
-
-    # First digit is first in normal lines, last digit is first in reversed lines, then sum
-    total = sum(int(lines[n][0] + rev_lines[n][0]) for n in range(len(lines)))
+    # Find the first and last digit on each line, using the lookahead pattern to find overlapping
+    # matches in a single pass, e.g. 'twone' gives both 'two' and 'one', then sum the values
+    total = sum(10*DIGIT_VALUES[(digits := DIGIT_PATTERN.findall(l))[0]] + DIGIT_VALUES[digits[-1]]
+                for l in lines)
 
     return total
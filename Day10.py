@@ -16,49 +16,109 @@ def get_input(input_file: str='Inputs/Day10_Inputs.txt', pad: bool=False) -> lis
 
     Returns
     -------
-    pipes : numpy.2darray(char)
-        2D numpy array of characters representing the grid.
+    pipes : numpy.2darray(bytes)
+        2D numpy array of single byte characters representing the grid.
 
     """
     # Parse input file
-    with open(input_file) as f:
-        # Extract grid and separate characters
-        pipes = [[c for c in l.strip()] for l in f.readlines()]
-        # Pad the grid on all sides if that option is selected
-        if pad:
-            pipes = [['.']*len(pipes[0])] + pipes
-            pipes += [['.']*len(pipes[0])]
-            pipes = [['.'] + r + ['.'] for r in pipes]
-    # Convert to numpy array on return for simpler indexing
-    return np.array(pipes)
-
-import operator
-
-def add_tuple(a, b):
+    with open(input_file, 'rb') as f:
+        # Extract the rows of the grid
+        rows = f.read().splitlines()
+    # View the joined rows as a 2D grid of single characters, without splitting them up in Python
+    pipes = np.frombuffer(b''.join(rows), dtype='S1').reshape(len(rows), -1)
+    # Pad the grid on all sides if that option is selected
+    if pad:
+        pipes = np.pad(pipes, 1, constant_values=b'.')
+
+    return pipes
+
+# Define all orthogonal directions
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+# Define integer codes for all types of pipe, with 0 used for any tile which isn't a pipe
+PIPE_CODES = {'|': 1, '-': 2, 'L': 3, 'J': 4, '7': 5, 'F': 6}
+# Define lookup table from the byte value of each character to the corresponding pipe code
+PIPE_LUT = np.zeros(256, dtype=np.int8)
+PIPE_LUT[[ord(pipe) for pipe in PIPE_CODES]] = list(PIPE_CODES.values())
+# Define directions which can be moved in from all types of pipe, indexed by pipe code
+PIPE_DIRS = np.array([[(0, 0), (0, 0)], [(-1, 0), (1, 0)], [(0, 1), (0, -1)], [(-1, 0), (0, 1)],
+                      [(-1, 0), (0, -1)], [(1, 0), (0, -1)], [(1, 0), (0, 1)]], dtype=np.int8)
+
+def encode_pipes(pipes):
     """
-    Adds two tuples elementwise.
+    Converts a 2D grid of pipe characters into a grid of integer pipe codes.
 
     Parameters
     ----------
-    a : tuple(int)
-        First tuple.
-    b : tuple(int)
-        Second tuple.
+    pipes : numpy.2darray(bytes)
+        2D numpy array of single byte characters representing the grid.
 
     Returns
     -------
-    tuple(int)
-        Result of elementwise addition of given tuples.
+    codes : numpy.2darray(int8)
+        2D numpy array of the pipe code of each tile, as defined in PIPE_CODES.
 
     """
-    # Map addition operator onto tuples
-    return tuple(map(operator.add, a, b))
+    # Look up the code of every tile from its byte value
+    codes = PIPE_LUT[pipes.view(np.uint8)]
 
-# Define all orthogonal directions
-DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-# Define directions which can be moved in from all types of pipe
-PIPE_DIRS = {'|': [(-1, 0), (1, 0)], '-': [(0, 1), (0, -1)], 'L': [(-1, 0), (0, 1)],
-              'J': [(-1, 0), (0, -1)], '7': [(1, 0), (0, -1)], 'F': [(1, 0), (0, 1)]}
+    return codes
+
+def trace_loop(codes, start_point):
+    """
+    Follows a loop of pipes around a 2D grid from a given start tile until it returns to the start.
+
+    Parameters
+    ----------
+    codes : numpy.2darray(int8)
+        2D numpy array of the pipe code of each tile, as defined in PIPE_CODES.
+    start_point : tuple(int)
+        Coordinates of the start tile, whose type of pipe is unknown.
+
+    Returns
+    -------
+    on_loop : numpy.2darray(bool)
+        2D numpy array which is True for every tile which is part of the loop.
+    start_dirs : tuple(tuple(int))
+        The two directions in which the start tile connects to the rest of the loop.
+
+    """
+    # Use nested lists of the directions for fast access to individual values
+    pipe_dirs = PIPE_DIRS.tolist()
+    # Start the loop at the start point
+    r0, c0 = start_point
+    on_loop = np.zeros(codes.shape, dtype=bool)
+    on_loop[r0, c0] = True
+    # Find which direction can be moved from the start point based on which pipes are connected
+    for dr, dc in DIRECTIONS:
+        # If there is a pipe in a given direction
+        if 0 <= (r := r0 + dr) < len(codes) and 0 <= (c := c0 + dc) < len(codes[0]) \
+            and (code := codes[r, c]):
+            # If the start point can be reached from that pipe, this is a valid direction to start
+            # moving in
+            if [-dr, -dc] in pipe_dirs[code]:
+                break
+    # Store the first direction moved from the start point
+    start_dir = (dr, dc)
+
+    # Until the start point is reached again (full loop)
+    while (r, c) != (r0, c0):
+        # Add the next point to the loop
+        on_loop[r, c] = True
+        # Find possible directions from the current pipe
+        (dr1, dc1), (dr2, dc2) = pipe_dirs[codes[r, c]]
+        # Choose the one which isn't the reverse of the last direction (don't go backwards)
+        if dr1 == -dr and dc1 == -dc:
+            dr, dc = dr2, dc2
+        else:
+            dr, dc = dr1, dc1
+        # Move to the next position and repeat
+        r += dr
+        c += dc
+
+    # The start tile connects to the first and last tiles in the loop
+    start_dirs = (start_dir, (-dr, -dc))
+
+    return on_loop, start_dirs
 
 def Day10_Part1(input_file: str='Inputs/Day10_Inputs.txt') -> int:
     """
@@ -99,36 +159,12 @@ def Day10_Part1(input_file: str='Inputs/Day10_Inputs.txt') -> int:
     pipes = get_input(input_file)
 
     # Find coordinates of the 'S' tile - the start point
-    start_point = tuple(i[0] for i in np.where(pipes == 'S'))
-    # Start the loop at the start point
-    loop = [start_point]
-    # Find which direction can be moved from the start point based on which pipes are connected
-    for next_dir in DIRECTIONS:
-        # If there is a pipe in a given direction
-        if pipes[(next_pos := add_tuple(start_point, next_dir))] in PIPE_DIRS:
-            # If the start point can be reached from that pipe, this is a valid direction to start
-            # moving in
-            if start_point in [add_tuple(next_pos, pipe_dir)\
-                               for pipe_dir in PIPE_DIRS[pipes[next_pos]]]:
-                break
-
-    # Until the start point is reached again (full loop)
-    while next_pos != loop[0]:
-        # Add the next point to the loop
-        loop.append(next_pos)
-        # Store the last direction moved in to avoid going backwards
-        last_dir = (-next_dir[0], -next_dir[1])
-        # Find possible directions from the current pipe
-        possible_dirs = PIPE_DIRS[pipes[loop[-1]]]
-        # Find the previous direction travelled in the list of two possible directions
-        last_dir_loc = possible_dirs.index(last_dir)
-        # And choose the other one (don't go backwards)
-        next_dir = possible_dirs[(last_dir_loc + 1)%2]
-        # Set this next position and repeat
-        next_pos = add_tuple(loop[-1], next_dir)
+    start_point = tuple(i[0] for i in np.where(pipes == b'S'))
+    # Follow the loop from the start point
+    on_loop, _ = trace_loop(encode_pipes(pipes), start_point)
 
     # The furthest point is just the length of the loop divided by 2
-    furthest_point = len(loop)//2
+    furthest_point = int(np.sum(on_loop))//2
     
     return furthest_point
 
@@ -171,94 +207,23 @@ def Day10_Part2(input_file: str='Inputs/Day10_Inputs.txt') -> int:
     #### FIND THE LOOP ####
         
     # Find coordinates of the 'S' tile - the start point
-    start_point = tuple(i[0] for i in np.where(pipes == 'S'))
-    # Start the loop at the start point
-    loop = [start_point]
-    # Find which direction can be moved from the start point based on which pipes are connected
-    for next_dir in DIRECTIONS:
-        # If there is a pipe in a given direction
-        if pipes[(next_pos := add_tuple(start_point, next_dir))] in PIPE_DIRS:
-            # If the start point can be reached from that pipe, this is a valid direction to start
-            # moving in
-            if start_point in [add_tuple(next_pos, pipe_dir)\
-                               for pipe_dir in PIPE_DIRS[pipes[next_pos]]]:
-                break
-
-    # Until the start point is reached again (full loop)
-    while next_pos != loop[0]:
-        # Add the next point to the loop
-        loop.append(next_pos)
-        # Store the last direction moved in to avoid going backwards
-        last_dir = (-next_dir[0], -next_dir[1])
-        # Find possible directions from the current pipe
-        possible_dirs = PIPE_DIRS[pipes[loop[-1]]]
-        # Replace all given pipe symbols with the corresponding box drawing symbols, both for
-        # easier visualisation but more importantly to differentiate pipes in the loop from other
-        # pipes, which could be enclosed
-        pipes[next_pos] = pipes[next_pos].replace('|', '│').replace('-', '─').replace('L', '└')\
-            .replace('J', '┘').replace('7', '┐').replace('F', '┌')
-        # Find the previous direction travelled in the list of two possible directions
-        last_dir_loc = possible_dirs.index(last_dir)
-        # And choose the other one (don't go backwards)
-        next_dir = possible_dirs[(last_dir_loc + 1)%2]
-        # Set this next position and repeat
-        next_pos = add_tuple(loop[-1], next_dir)
+    start_point = tuple(i[0] for i in np.where(pipes == b'S'))
+    # Convert pipes to integer codes
+    codes = encode_pipes(pipes)
+    # Follow the loop from the start point, marking every tile which is part of it
+    on_loop, start_dirs = trace_loop(codes, start_point)
 
     #### SEARCH FOR ENCLOSED TILES ####
 
-    # Starting in the top left corner
-    pos = (0, 0)
-    # Start outside the loop and not on a row of the loop
-    inside, row_type = 0, 0
-    # Count enclosed tiles
-    enclosed_tiles = 0
-    # While there are rows left to search
-    while pos[0] < len(pipes):
-        # While there are positions on the current row left to search
-        while pos[1] < len(pipes[0]):
-            # If the current tile is not part of the loop and we are inside the loop, count it
-            # as an enclosed tile
-            if pipes[pos] in {'.', '|', '-', 'L', '7', 'J', 'F'} and inside:
-                enclosed_tiles += 1
-            # Else if the current tile is a vertical section of the loop, switch between
-            # inside/outside depending on the current state
-            elif pipes[pos] == '│':
-                inside = (inside + 1)%2
-            # Else if the current tile is a corner section of the loop, if we are already on a row
-            # then depending on the previous corner tile crossed this one may or may not invert
-            # the inside/outside state
-            elif pipes[pos] in {'┌', '┐', '└', '┘'}:
-                # If the current tile is a south-east corner, it must be starting a row which
-                # comes from below, corresponding to row_type -1
-                if pipes[pos] == '┌':
-                    row_type = -1
-                # Else if the current tile is a north-east corner, it must be starting a row which
-                # comes from above, corresponding to row_type 1
-                elif pipes[pos] == '└':
-                    row_type = 1
-                # Else if the current tile is a south-west corner, it must be ending a row by
-                # moving down
-                elif pipes[pos] == '┐':
-                    # If the row_type is 1, i.e. the previous corner came from above, then
-                    # together they act like a vertical loop section, inverting the inside/outside
-                    # state, if row_type is -1 then the state doesn't change
-                    if row_type == 1:
-                        inside = (inside + 1)%2
-                    # Set row_type back to zero as we have left the row
-                    row_type = 0
-                # Else if the current tile is a north-west corner, it must be ending a row by
-                # moving up
-                elif pipes[pos] == '┘':
-                    # If the row_type is -1, i.e. the previous corner came from below, then
-                    # together they act like a vertical loop section, inverting the inside/outside
-                    # state, if row_type is 1 then the state doesn't change
-                    if row_type == -1:
-                        inside = (inside + 1)%2
-                    # Set row_type back to zero as we have left the row
-                    row_type = 0
-            # Move to the next position to the right
-            pos = add_tuple(pos, (0, 1))
-        # Move to the beginning of the next row
-        pos = (pos[0] + 1, 0)
+    # Find the tiles of the loop which connect to the tile above. Moving along a row, crossing one
+    # of these switches between inside/outside the loop, as an 'F-J' or 'L-7' section acts like a
+    # single vertical section, while an 'F-7' or 'L-J' section doesn't cross the loop at all
+    north = on_loop & np.isin(codes, [PIPE_CODES['|'], PIPE_CODES['L'], PIPE_CODES['J']])
+    # The start tile connects north if the loop leaves or enters it from above
+    north[start_point] = (-1, 0) in start_dirs
+    # Tiles are inside the loop if an odd number of crossings lie to their left on the same row
+    inside = np.cumsum(north, axis=1)%2 == 1
+    # Count all tiles which are inside the loop and not part of it
+    enclosed_tiles = int(np.sum(inside & ~on_loop))
     
     return enclosed_tiles
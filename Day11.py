@@ -11,15 +11,46 @@ def get_input(input_file: str='Inputs/Day11_Inputs.txt') -> list:
         The default is 'Inputs/Day11_Inputs.txt'.
     Returns
     -------
-    space : numpy.2darray(char)
-        2D numpy array of characters representing the grid of space.
+    space : numpy.2darray(bytes)
+        2D numpy array of single byte characters representing the grid of space.
 
     """
     # Parse input file
-    with open(input_file) as f:
-        space = [[c for c in l.strip()] for l in f.readlines()]
+    with open(input_file, 'rb') as f:
+        rows = f.read().splitlines()
+    # View the joined rows as a 2D grid of single characters, without splitting them up in Python
+    space = np.frombuffer(b''.join(rows), dtype='S1').reshape(len(rows), -1)
 
-    return np.array(space)
+    return space
+
+def sum_distances(coords, empty_before, expansion):
+    """
+    Calculates the sum of the distances along a single axis between every pair of galaxies, where
+    every empty row/column between two galaxies adds a given amount of extra distance.
+
+    For a sorted list of G coordinates x, the i-th coordinate is subtracted from every one of the
+    G-i-1 coordinates after it and has every one of the i coordinates before it subtracted from
+    it, so the sum over all pairs is just the sum of (2i - G + 1)*x[i].
+
+    Parameters
+    ----------
+    coords : numpy.1darray(int)
+        The coordinates of every galaxy along the axis.
+    empty_before : numpy.1darray(int)
+        The number of empty rows/columns before each row/column along the axis.
+    expansion : int
+        The number of extra rows/columns which should be added for every empty row/column.
+
+    Returns
+    -------
+    int
+        The sum of the distances along the axis between every pair of galaxies.
+
+    """
+    # Shift each coordinate by the expansion of every empty row/column before it, and sort
+    coords = np.sort(coords + expansion*empty_before[coords])
+    # Weight each coordinate by how many times it is added minus how many times it is subtracted
+    return int(np.sum((2*np.arange(len(coords)) - len(coords) + 1)*coords))
 
 def Day11_Part1(input_file: str='Inputs/Day11_Inputs.txt') -> int:
     """
@@ -44,36 +75,16 @@ def Day11_Part1(input_file: str='Inputs/Day11_Inputs.txt') -> int:
     # Parse input file to get the grid
     space = get_input(input_file)
     # Find all the galaxy coordinates
-    galaxies = np.where(space == '#')
-    # Convert to tuples
-    galaxies = [(galaxies[0][j], galaxies[1][j]) for j in range(len(galaxies[0]))]
-    # Find indices of empty rows and columns
-    empty_rows = np.array([i for i in range(len(space)) if set(space[i, :]) == {'.'}])
-    empty_cols = np.array([j for j in range(len(space[0])) if set(space[:, j]) == {'.'}])
-
-    # Count the total distance
-    total_distance = 0
-    # For every galaxy
-    for i in range(len(galaxies)):
-        # For every other galaxy not counted yet
-        for j in range(i+1, len(galaxies)):
-            # Get galaxy coordinates
-            galaxy1 = galaxies[i]
-            galaxy2 = galaxies[j]
-            # Find shortest distance between the galaxies (Manhattan distance)
-            total_distance += sum(abs(galaxy1[i] - galaxy2[i]) for i in range(2))
-            # Filter empty rows which have a higher index than the lower galaxy
-            rows_more = empty_rows[min(galaxy1[0], galaxy2[0]) < empty_rows]
-            # Count how many of the filtered rows have a lower index than the higher galaxy
-            # These are all the empty rows between the two galaxies, so should be accounted for
-            # again to include expansion
-            total_distance += sum(rows_more < max(galaxy1[0], galaxy2[0]))
-            # Filter empty columns which have a higher index than the lower galaxy
-            cols_more = empty_cols[min(galaxy1[1], galaxy2[1]) < empty_cols]
-            # Count how many of the filtered columns have a lower index than the higher galaxy
-            # These are all the empty columns between the two galaxies, so should be accounted for
-            # again to include expansion
-            total_distance += sum(cols_more < max(galaxy1[1], galaxy2[1]))
+    galaxies = np.where(space == b'#')
+    # Count the empty rows and columns up to each row and column, which for any row or column
+    # containing a galaxy is the number of empty ones before it
+    empty = space == b'.'
+    empty_rows = np.cumsum(np.all(empty, axis=1))
+    empty_cols = np.cumsum(np.all(empty, axis=0))
+
+    # Sum the distances between every pair of galaxies along each axis, including expansion
+    total_distance = sum_distances(galaxies[0], empty_rows, 1) \
+        + sum_distances(galaxies[1], empty_cols, 1)
     
     return total_distance
 
@@ -104,35 +115,15 @@ def Day11_Part2(input_file: str='Inputs/Day11_Inputs.txt', expansion = 1000000 -
     # Parse input file to get the grid
     space = get_input(input_file)
     # Find all the galaxy coordinates
-    galaxies = np.where(space == '#')
-    # Convert to tuples
-    galaxies = [(galaxies[0][j], galaxies[1][j]) for j in range(len(galaxies[0]))]
-    # Find indices of empty rows and columns
-    empty_rows = np.array([i for i in range(len(space)) if set(space[i, :]) == {'.'}])
-    empty_cols = np.array([j for j in range(len(space[0])) if set(space[:, j]) == {'.'}])
-
-    # Count the total distance
-    total_distance = 0
-    # For every galaxy
-    for i in range(len(galaxies)):
-        # For every other galaxy not counted yet
-        for j in range(i+1, len(galaxies)):
-            # Get galaxy coordinates
-            galaxy1 = galaxies[i]
-            galaxy2 = galaxies[j]
-            # Find shortest distance between the galaxies (Manhattan distance)
-            total_distance += sum(abs(galaxy1[i] - galaxy2[i]) for i in range(2))
-            # Filter empty rows which have a higher index than the lower galaxy
-            rows_more = empty_rows[min(galaxy1[0], galaxy2[0]) < empty_rows]
-            # Count how many of the filtered rows have a lower index than the higher galaxy
-            # These are all the empty rows between the two galaxies, so should be added again
-            # 'expansion' times to include expansion
-            total_distance += expansion*sum(rows_more < max(galaxy1[0], galaxy2[0]))
-            # Filter empty columns which have a higher index than the lower galaxy
-            cols_more = empty_cols[min(galaxy1[1], galaxy2[1]) < empty_cols]
-            # Count how many of the filtered columns have a lower index than the higher galaxy
-            # These are all the empty columns between the two galaxies, so should be added again
-            # 'expansion' times to include expansion
-            total_distance += expansion*sum(cols_more < max(galaxy1[1], galaxy2[1]))
+    galaxies = np.where(space == b'#')
+    # Count the empty rows and columns up to each row and column, which for any row or column
+    # containing a galaxy is the number of empty ones before it
+    empty = space == b'.'
+    empty_rows = np.cumsum(np.all(empty, axis=1))
+    empty_cols = np.cumsum(np.all(empty, axis=0))
+
+    # Sum the distances between every pair of galaxies along each axis, including expansion
+    total_distance = sum_distances(galaxies[0], empty_rows, expansion) \
+        + sum_distances(galaxies[1], empty_cols, expansion)
     
     return total_distance
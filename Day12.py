@@ -27,7 +27,7 @@ def get_input(input_file: str='Inputs/Day12_Inputs.txt', unfold=False) -> list:
     # Parse input file
     with open(input_file) as f:
         # Extract lines and split into springs and group sizes
-        lines = [l.strip().split() for l in f.readlines()]
+        lines = [l.split() for l in f.read().splitlines()]
         # If unfolding
         if unfold:
             # Multiply springs by 5 and join with '?', and multiply group sizes by 5
@@ -40,16 +40,17 @@ def get_input(input_file: str='Inputs/Day12_Inputs.txt', unfold=False) -> list:
 
     return springs
 
-import functools
-
-# Use a cache wrapper to massively speed up runtime
-@functools.lru_cache(maxsize=None)
 def valid_arrs(arr, nums):
     """
-    Recursively finds the number of unique valid arrangements which can correspond to a given
-    spring record, where '.' indicates an operational spring, '#' indicates a damaged spring and
-    '?' could be either type of spring. The sizes of each contiguous group of damaged springs in
-    the row of springs is also given, thus constraining the possible states.
+    Finds the number of unique valid arrangements which can correspond to a given spring record,
+    where '.' indicates an operational spring, '#' indicates a damaged spring and '?' could be
+    either type of spring. The sizes of each contiguous group of damaged springs in the row of
+    springs is also given, thus constraining the possible states.
+
+    Groups are placed one at a time starting from the last, tracking the number of ways of
+    arranging the remaining groups in the record from every position onwards. A group of length L
+    fits at position i if there are no operational springs in arr[i:i+L] and the spring after it
+    is not damaged, which is tested with bitmasks of the operational and damaged springs.
 
     Parameters
     ----------
@@ -64,48 +65,42 @@ def valid_arrs(arr, nums):
         The number of unique and valid arrangements of the springs.
 
     """
-    # Start with count of zero
-    arrs = 0
-    # Find position of first '?'
-    i = arr.index('?')
-    # Test each possible spring type
-    for rep in ['#', '.']:
-        # Create a copy of the array as a list to allow for item assignment
-        arr_copy = [c for c in arr]
-        # Perform substitution for current test
-        arr_copy[i] = rep
-        # Format back to string
-        arr_copy = ''.join(arr_copy)
-        # If there are still further unknowns to test
-        if '?' in arr_copy:
-            # Find the sizes of each group of '#' up to the index just replaced
-            test = tuple(len(s) for s in arr_copy[:i+1].split('.') if s)
-            # If there are no '#'s yet, just recursively continue testing the row at the next '?'
-            if len(test) == 0:
-                arrs += valid_arrs(arr_copy, nums)
-            # Else if the test is valid so far, i.e. doesn't give more groups than are possible,
-            # matches the given groups up to the latest complete one and hasn't exceeded the
-            # maximum possible size of the latest damaged group, then we continue recursively,
-            # otherwise abondon this branch
-            elif len(test) <= len(nums) and test[:-1] == nums[:len(test)-1] and test[-1] <= nums[len(test)-1]:
-                # Now we will continue recursively finding the valid arrangements of the remaining
-                # string, but we can cut the part of the string which is now set in stone, which
-                # increases the effectiveness of the cache by generalising the strings more:
-
-                # If we replaced with '.' then find the end of the last complete group of '#' and
-                # cut the string at the beginning of that group, and cut the group size tuple
-                # accordingly
-                if rep == '.':
-                    arrs += valid_arrs(arr_copy[arr_copy.rindex('#', 0, i) - test[-1] + 1:],
-                                       nums[len(test)-1:])
-                # Else if we replaced with '#' then move to the beginning of the current group of
-                # '#' and cut there, and cut the group size tuple accordingly
-                else:
-                    arrs += valid_arrs(arr_copy[i - test[-1] + 1:], nums[len(test)-1:])
-        # Else if there are no more '?' just test if this is a valid arrangement and count it if so
-        else:
-            if tuple(len(s) for s in arr_copy.split('.') if s) == nums:
-                arrs += 1
+    # Length of the record
+    n = len(arr)
+    # Bitmasks of the operational and damaged springs, with bit i set by the spring at position i
+    operational = sum(1 << i for i, c in enumerate(arr) if c == '.')
+    damaged = sum(1 << i for i, c in enumerate(arr) if c == '#')
+
+    # Number of ways to arrange no groups from each position onwards, which is one if there are no
+    # damaged springs left and zero otherwise, with an extra entry for starting past the end
+    last_damaged = arr.rfind('#')
+    ways = [0]*(last_damaged + 1) + [1]*(n - last_damaged + 1)
+
+    # Find the earliest position each group can start at, leaving room for all earlier groups,
+    # and the space needed by each group and all later groups
+    starts = [sum(nums[:g]) + g for g in range(len(nums))]
+    needed = [sum(nums[g:]) + len(nums) - g - 1 for g in range(len(nums))]
+
+    # Add each group in turn, starting from the last one
+    for g in range(len(nums) - 1, -1, -1):
+        # Size of the group and mask covering the springs in it
+        size = nums[g]
+        mask = (1 << size) - 1
+        # Number of ways to arrange this group and all later groups from each position onwards
+        new_ways = [0]*(n + 2)
+        # For each position the group could start at while leaving room for all other groups,
+        # from the last to the first
+        for i in range(n - needed[g], starts[g] - 1, -1):
+            # If this spring isn't damaged, the group can start further along instead
+            if not damaged >> i & 1:
+                new_ways[i] = new_ways[i + 1]
+            # If the group fits here, the later groups can start after the spring following it
+            if not operational >> i & mask and not damaged >> (i + size) & 1:
+                new_ways[i] += ways[i + size + 1]
+        ways = new_ways
+
+    # Count the ways to arrange all groups from the start of the record
+    arrs = ways[0]
 
     return arrs
 
@@ -136,12 +131,12 @@ def Day12_Part1(input_file: str='Inputs/Day12_Inputs.txt') -> int:
     total = 0
     # For each spring record
     for arr, nums in springs:
-        # Recursively find the number of possible valid arrangements
+        # Find the number of possible valid arrangements
         total += valid_arrs(arr, nums)
     
     return total
     
-from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
 
 def Day12_Part2(input_file: str='Inputs/Day12_Inputs.txt') -> int:
     """
@@ -170,11 +165,9 @@ def Day12_Part2(input_file: str='Inputs/Day12_Inputs.txt') -> int:
     # Extract spring condition records and group sizes from input file, unfold and format
     springs = get_input(input_file, unfold=True)
     
-    # Count total states
-    total = 0
-    # For each spring record
-    for arr, nums in tqdm(springs):
-        # Recursively find the number of possible valid arrangements
-        total += valid_arrs(arr, nums)
+    # Each row is independent, so find the number of possible valid arrangements of the rows in
+    # parallel across multiple processes, and sum them
+    with ProcessPoolExecutor() as pool:
+        total = sum(pool.map(valid_arrs, *zip(*springs), chunksize=50))
     
     return total
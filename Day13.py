@@ -1,4 +1,5 @@
 import numpy as np
+from pathlib import Path
 
 def get_input(input_file: str='Inputs/Day13_Inputs.txt') -> list:
     """
@@ -14,30 +15,111 @@ def get_input(input_file: str='Inputs/Day13_Inputs.txt') -> list:
 
     Returns
     -------
-    patterns : list(numpy.2darray(char))
-        List of patterns, where each pattern is formatted as a 2D numpy array of characters,
-        either '.' or '#', for easier indexing.
+    patterns : list(tuple(numpy.1darray(uint64)))
+        List of patterns, where each pattern is formatted as a tuple (rows, cols) of the rows and
+        columns of the pattern, each packed into an integer with a set bit for every rock (#).
 
     """
-    # Parse input file
-    with open(input_file) as f:
-        # Extract lines
-        lines = [l.strip() for l in f.readlines()]
-        # Start list of patterns
-        patterns = [[]]
-        for l in lines:
-            # If newline, convert latest pattern to numpy array and add new empty list
-            if len(l) == 0:
-                patterns[-1] = np.array(patterns[-1])
-                patterns.append([])
-            # Else add row to current pattern and split into individual characters
-            else:
-                patterns[-1].append([c for c in l])
-        # Convert the final pattern to a numpy array
-        patterns[-1] = np.array(patterns[-1])
+    # Read the whole input file at once and split into lines
+    lines = Path(input_file).read_bytes().splitlines()
+    # Start list of patterns
+    patterns = [[]]
+    for l in lines:
+        # If newline, pack latest pattern and add new empty list
+        if len(l) == 0:
+            patterns[-1] = pack_pattern(patterns[-1])
+            patterns.append([])
+        # Else add row to current pattern
+        else:
+            patterns[-1].append(l)
+    # Pack the final pattern
+    patterns[-1] = pack_pattern(patterns[-1])
 
     return patterns
 
+def pack_pattern(pattern):
+    """
+    Packs the rows and columns of a pattern of ash (.) and rock (#) into integers, with a set bit
+    for every rock, so that lines of the pattern can be compared with a single operation.
+
+    Parameters
+    ----------
+    pattern : list(bytes)
+        The rows of the pattern.
+
+    Returns
+    -------
+    rows : numpy.1darray(uint64)
+        The packed rows of the pattern.
+    cols : numpy.1darray(uint64)
+        The packed columns of the pattern.
+
+    """
+    # View the joined rows as a 2D grid of ASCII codes, and find the rocks
+    rocks = np.frombuffer(b''.join(pattern), dtype=np.uint8).reshape(len(pattern), -1) == ord('#')
+    # Read each row and column as a binary number, with rock as 1 and ash as 0, by multiplying
+    # each point by its place value and summing
+    rows = rocks.astype(np.uint64) @ (np.uint64(1) << np.arange(rocks.shape[1], dtype=np.uint64))
+    cols = rocks.T.astype(np.uint64) @ (np.uint64(1) << np.arange(rocks.shape[0], dtype=np.uint64))
+
+    return rows, cols
+
+def find_reflections(patterns, smudges):
+    """
+    Finds the line of reflection in each of a series of patterns, along the axis of the given
+    packed lines, where the lines either side are mirrored up to the end of the smaller side,
+    except for a given number of points which do not match. All patterns are searched at once, by
+    stacking their lines into a single array padded with empty lines.
+
+    Parameters
+    ----------
+    patterns : list(numpy.1darray(uint64))
+        The packed rows or columns of each pattern.
+    smudges : int
+        The number of points which should not match across the line of reflection.
+
+    Returns
+    -------
+    reflections : numpy.1darray(int)
+        The number of lines before the line of reflection in each pattern, or 0 if there is none.
+
+    """
+    # Find the number of lines in each pattern, and the most lines in any pattern
+    lengths = np.array([len(lines) for lines in patterns])
+    n = lengths.max()
+    # Find which positions in the stacked array are real lines rather than padding
+    is_line = np.arange(n) < lengths[:, None]
+    # Stack the lines of every pattern
+    lines = np.zeros((len(patterns), n), dtype=np.uint64)
+    lines[is_line] = np.concatenate(patterns)
+
+    # XOR every pair of lines in each pattern, so any set bits are points which do not match
+    xor = lines[:, :, None] ^ lines[:, None, :]
+    # If there should be no mismatched points, any pair of lines which aren't identical rules out
+    # a line of reflection, so just compare the packed lines
+    if smudges == 0:
+        mismatches = xor != 0
+    # Else count the points which do not match between every pair of lines
+    else:
+        mismatches = np.unpackbits(xor.view(np.uint8), axis=-1)\
+            .reshape(len(patterns), n, n, -1).sum(axis=-1)
+    # Ignore any pairs of lines involving padding
+    mismatches = mismatches*(is_line[:, :, None] & is_line[:, None, :])
+    # The lines which are mirrored across the line of reflection after line k are all the pairs
+    # of lines (i, j) with i + j = 2k - 1, so sum the mismatches along every anti-diagonal of each
+    # pattern, which counts each pair twice
+    diagonal = np.arange(len(patterns))[:, None, None]*2*n + np.add.outer(np.arange(n), np.arange(n))
+    diagonals = np.bincount(diagonal.ravel(), weights=mismatches.ravel(),
+                            minlength=len(patterns)*2*n).reshape(len(patterns), 2*n)
+    # Find all lines of reflection within each pattern with exactly the right number of
+    # mismatched points
+    matches = (diagonals[:, 1::2] == 2*smudges) & (np.arange(1, n + 1) < lengths[:, None])
+
+    # Return the first line of reflection in each pattern, if there is one
+    reflections = np.where(matches.any(axis=1), matches.argmax(axis=1) + 1, 0)
+
+    return reflections
+
 def Day13_Part1(input_file: str='Inputs/Day13_Inputs.txt') -> int:
     """
     Finds the summary of a series of patterns of rock and ash given in an input file. Each pattern
@@ -62,45 +144,13 @@ def Day13_Part1(input_file: str='Inputs/Day13_Inputs.txt') -> int:
     # Parse input file and extract patterns
     patterns = get_input(input_file)
 
-    # Sum up all summaries
-    summary = 0
-    # For each pattern
-    for pattern in patterns:
-        # Boolean check for if a vertical reflection is found
-        col_ref = False
-        # For each column, starting at the second column, which will be tested as the far left
-        # column of the mirrored section on the right of the line of reflection
-        for col in range(1, len(pattern[0])):
-            # Extract the section of the pattern to the left of the current tested line of ref.
-            left_section = pattern[:, max(0, 2*col - len(pattern[0])):col]
-            # Extract the section of the pattern to the right of the current tested line of ref.
-            right_section = pattern[:, col:2*col]
-            # If the left side equals the right side flipped vertically in every place, this is a
-            # valid line of reflection
-            if (left_section == np.flip(right_section, axis=1)).all():
-                # Add the column number to the left of the line of reflection
-                summary += col
-                # Set boolean check that a vertical line of reflection was found
-                col_ref = True
-                # No need to check for any further vertical lines of reflection
-                break
-        # If vertical reflection was found, no need to check for any horizontal lines of reflection
-        if col_ref:
-            continue
-        # Else for each row, starting at the second row, which will be tested as the top row of the
-        # mirrored section below the line of reflection
-        for row in range(1, len(pattern)):
-            # Extract the section of the pattern above the current tested line of reflection
-            top_section = pattern[max(0, 2*row - len(pattern)):row, :]
-            # Extract the section of the pattern below the current tested line of reflection
-            bottom_section = pattern[row:2*row, :]
-            # If the top section equals the bottom section flipped horizontally in every place,
-            # this is a valid line of reflection
-            if (top_section == np.flip(bottom_section, axis=0)).all():
-                # Add 100 times the row number above the line of reflection
-                summary += 100*row
-                # No need to check for any further horizontal lines of reflection
-                break
+    # Separate the rows and columns of every pattern
+    rows, cols = zip(*patterns)
+    # Find the vertical and horizontal lines of reflection in every pattern
+    col_refs, row_refs = find_reflections(cols, 0), find_reflections(rows, 0)
+    # Sum the number of columns to the left of each vertical line of reflection, or where there
+    # isn't one, 100 times the number of rows above the horizontal line of reflection
+    summary = int(np.sum(np.where(col_refs, col_refs, 100*row_refs)))
     
     return summary
 
@@ -130,46 +180,14 @@ def Day13_Part2(input_file: str='Inputs/Day13_Inputs.txt') -> int:
     # Parse input file and extract patterns
     patterns = get_input(input_file)
 
-    # Sum up all summaries
-    summary = 0
-    # For each pattern
-    for pattern in patterns:
-        # Boolean check for if a vertical reflection is found
-        col_ref = False
-        # For each column, starting at the second column, which will be tested as the far left
-        # column of the mirrored section on the right of the line of reflection
-        for col in range(1, len(pattern[0])):
-            # Extract the section of the pattern to the left of the current tested line of ref.
-            left_section = pattern[:, max(0, 2*col - len(pattern[0])):col]
-            # Extract the section of the pattern to the right of the current tested line of ref.
-            right_section = pattern[:, col:2*col]
-            # For a valid line of relfection with a single smudge, there should be exactly one
-            # point which does not match between the two sides, so find the number of mismatched
-            # points, and find where it is exactly 1
-            if (left_section != np.flip(right_section, axis=1)).sum() == 1:
-                # Add the column number to the left of the line of reflection
-                summary += col
-                # Set boolean check that a vertical line of reflection was found
-                col_ref = True
-                # No need to check for any further vertical lines of reflection
-                break
-        # If vertical reflection was found, no need to check for any horizontal lines of reflection
-        if col_ref:
-            continue
-        # Else for each row, starting at the second row, which will be tested as the top row of the
-        # mirrored section below the line of reflection
-        for row in range(1, len(pattern)):
-            # Extract the section of the pattern above the current tested line of reflection
-            top_section = pattern[max(0, 2*row - len(pattern)):row, :]
-            # Extract the section of the pattern below the current tested line of reflection
-            bottom_section = pattern[row:2*row, :]
-            # For a valid line of relfection with a single smudge, there should be exactly one
-            # point which does not match between the two sides, so find the number of mismatched
-            # points, and find where it is exactly 1
-            if (top_section != np.flip(bottom_section, axis=0)).sum() == 1:
-                # Add 100 times the row number above the line of reflection
-                summary += 100*row
-                # No need to check for any further horizontal lines of reflection
-                break
+    # Separate the rows and columns of every pattern
+    rows, cols = zip(*patterns)
+    # For a valid line of reflection with a single smudge, there should be exactly one point
+    # which does not match between the two sides, so find all such vertical and horizontal lines
+    # of reflection in every pattern
+    col_refs, row_refs = find_reflections(cols, 1), find_reflections(rows, 1)
+    # Sum the number of columns to the left of each vertical line of reflection, or where there
+    # isn't one, 100 times the number of rows above the horizontal line of reflection
+    summary = int(np.sum(np.where(col_refs, col_refs, 100*row_refs)))
     
     return summary
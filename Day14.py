@@ -1,4 +1,6 @@
 from time import perf_counter
+from pathlib import Path
+import numpy as np
 
 def time_function(func):
     """
@@ -33,17 +35,99 @@ def get_input(input_file: str='Inputs/Day14_Inputs.txt') -> list:
 
     Returns
     -------
-    rocks : tuple(str)
-        Tuple of strings, with each string giving the layout of a different row of the dish.
+    rocks : tuple(int)
+        The rock layout packed into integers, in the form (round, cube, width, height). Each row
+        of the layout is packed into width bits, starting from the North row and the West column at
+        the lowest bit, with an extra column on the East of every row. Round and cube are the
+        layouts of the round and cubic rocks respectively, with a set bit for every rock, and the
+        extra column is filled with cubic rocks so that no rocks can roll between rows.
 
     """
-    # Parse input file
-    with open(input_file) as f:
-        # Extract lines and format in tuple
-        rocks = tuple(l.strip() for l in f.readlines())
+    # Read the whole input file at once and split into lines
+    lines = Path(input_file).read_bytes().splitlines()
+    # Join all rows into one binary string with the first bit last, adding the extra column
+    layout = b''.join(b'#' + row[::-1] for row in lines[::-1])
+    # Pack the positions of each type of rock into an integer
+    rocks = (int(layout.translate(ROUND_BITS), 2), int(layout.translate(CUBE_BITS), 2),
+             len(lines[0]) + 1, len(lines))
 
     return rocks
 
+# Define translation tables to convert a rock layout to binary strings for each type of rock
+ROUND_BITS = bytes.maketrans(b'O#.', b'100')
+CUBE_BITS = bytes.maketrans(b'O#.', b'010')
+
+def tilt_lower(round_rocks, free, step):
+    """
+    Rolls all round rocks in a packed layout towards the lower bits, i.e. North or West, until they
+    settle, by repeatedly moving every round rock which has an empty space next to it in that
+    direction by one space, until none can move.
+
+    Parameters
+    ----------
+    round_rocks : int
+        The packed layout of the round rocks.
+    free : int
+        The packed layout of all positions which rocks can occupy, i.e. all positions on the dish
+        which aren't cubic rocks.
+    step : int
+        The number of bits a rock moves by per space rolled, i.e. the row width when rolling North
+        or 1 when rolling West.
+
+    Returns
+    -------
+    round_rocks : int
+        The packed layout of the round rocks after they have settled.
+
+    """
+    # Until no more rocks can move
+    while True:
+        # Find all round rocks with an empty space in the direction of the tilt
+        movable = round_rocks & ((free & ~round_rocks) << step)
+        # If no rocks can move then they have all settled
+        if not movable:
+            return round_rocks
+        # Remove them from their current positions and add them to the empty spaces
+        round_rocks ^= movable | (movable >> step)
+
+def tilt_higher(round_rocks, free, step):
+    """
+    Rolls all round rocks in a packed layout towards the higher bits, i.e. South or East, until
+    they settle, by repeatedly moving every round rock which has an empty space next to it in that
+    direction by one space, until none can move.
+
+    Parameters
+    ----------
+    round_rocks : int
+        The packed layout of the round rocks.
+    free : int
+        The packed layout of all positions which rocks can occupy, i.e. all positions on the dish
+        which aren't cubic rocks.
+    step : int
+        The number of bits a rock moves by per space rolled, i.e. the row width when rolling South
+        or 1 when rolling East.
+
+    Returns
+    -------
+    round_rocks : int
+        The packed layout of the round rocks after they have settled.
+
+    """
+    # Until no more rocks can move
+    while True:
+        # Find all round rocks with an empty space in the direction of the tilt
+        movable = round_rocks & ((free & ~round_rocks) >> step)
+        # If no rocks can move then they have all settled
+        if not movable:
+            return round_rocks
+        # Remove them from their current positions and add them to the empty spaces
+        round_rocks ^= movable | (movable << step)
+
+# Define the function used to tilt in each direction, and whether each direction moves rocks by a
+# whole row (North and South) or a single column (East and West)
+TILTS = {'N': (tilt_lower, True), 'W': (tilt_lower, False),
+         'S': (tilt_higher, True), 'E': (tilt_higher, False)}
+
 import functools
 
 # Use cache to decrease runtime
@@ -57,64 +141,26 @@ def roll_rocks(rocks, direction):
 
     Parameters
     ----------
-    rocks : tuple(str)
-        Tuple of strings, with each string giving the rock layout of a different row of the dish.
+    rocks : tuple(int)
+        The packed rock layout, as given by get_input.
     direction : str
         The direction of the tilt; N for North, E for East, etc.
 
     Returns
     -------
-    rocks : tuple(str)
-        The rock layout after the rocks have settled following the tilt of the dish.
+    rocks : tuple(int)
+        The packed rock layout after the rocks have settled following the tilt of the dish.
 
     """
-    # Format the rock layout into a 2D list of characters, with the direction of the rolling set
-    # to the end of the rows
-    if direction == 'N':
-        rocks = [[row[col] for row in rocks[::-1]] for col in range(len(rocks[0]))]
-    elif direction == 'S':
-        rocks = [[row[col] for row in rocks] for col in range(len(rocks[0]))[::-1]]
-    elif direction == 'W':
-        rocks = [[col for col in l[::-1]] for l in rocks]
-    elif direction == 'E':
-        rocks = [[col for col in l] for l in rocks]
-
-    # For each row in the layout
-    for row in range(len(rocks)):
-        # For each column in the row, starting from the right (not including rightmost row as any
-        # rocks here cannot move)
-        for col in range(len(rocks[row]) - 1)[::-1]:
-            # If a round rock is found
-            if rocks[row][col] == 'O':
-                # Try and find the first cubic rock to the right of this one
-                try:
-                    next_cube = rocks[row].index('#', col)
-                # If none exist then set to the rightmost end of the row
-                except ValueError:
-                    next_cube = len(rocks[row])
-                # Try and find the first round rock to the right of this one
-                try:
-                    next_round = rocks[row].index('O', col+1)
-                # If none exist then set to the rightmost end of the row
-                except ValueError:
-                    next_round = len(rocks[row])
-                # Change the current position to empty space
-                rocks[row][col] = '.'
-                # Set the position one to the left of the nearest rock on the right of this one, to
-                # be a round rock
-                rocks[row][min(next_cube, next_round) - 1] = 'O'
-
-    # Depending on how the rock layout was formatted before, convert it back into the general form
-    if direction == 'N':
-        rocks = tuple(''.join(row[col] for row in rocks) for col in range(len(rocks[0]))[::-1])
-    elif direction == 'S':
-        rocks = tuple(''.join(row[col] for row in rocks[::-1]) for col in range(len(rocks[0])))
-    elif direction == 'W':
-        rocks = tuple(''.join(row[::-1]) for row in rocks)
-    elif direction == 'E':
-        rocks = tuple(''.join(row) for row in rocks)
+    # Unpack the layout
+    round_rocks, cube_rocks, width, height = rocks
+    # Find all positions on the dish which aren't cubic rocks
+    free = ((1 << width*height) - 1) & ~cube_rocks
+    # Tilt in the given direction, moving by a whole row or a single column per space rolled
+    tilt, by_row = TILTS[direction]
+    round_rocks = tilt(round_rocks, free, width if by_row else 1)
 
-    return rocks
+    return (round_rocks, cube_rocks, width, height)
 
 def rock_load(rocks):
     """
@@ -125,8 +171,8 @@ def rock_load(rocks):
 
     Parameters
     ----------
-    rocks : tuple(str)
-        Tuple of strings, with each string giving the rock layout of a different row of the dish.
+    rocks : tuple(int)
+        The packed rock layout, as given by get_input.
 
     Returns
     -------
@@ -134,8 +180,15 @@ def rock_load(rocks):
         The total load on the dish.
 
     """
-    # Calculate the product of each round rock with its row number + 1 and sum
-    load = sum((n+1)*row.count('O') for n, row in enumerate(rocks[::-1]))
+    # Unpack the layout
+    round_rocks, _, width, height = rocks
+    # Unpack the bits of the round rocks into a 2D grid, with the North row first
+    grid = np.unpackbits(np.frombuffer(round_rocks.to_bytes(width*height//8 + 1, 'little'),
+                                       dtype=np.uint8), bitorder='little')[:width*height]\
+        .reshape(height, width)
+    # Calculate the product of the number of round rocks in each row with its distance from the
+    # South edge and sum
+    load = int(grid.sum(axis=1) @ np.arange(height, 0, -1))
 
     return load
 
@@ -171,7 +224,6 @@ def Day14_Part1(input_file: str='Inputs/Day14_Inputs.txt') -> int:
     
     return load
 
-@functools.lru_cache(maxsize=None)
 def cycle_rocks(rocks):
     """
     Performs a single cycle of tilts of a satellite with a given layout of rocks on its surface in
@@ -182,21 +234,27 @@ def cycle_rocks(rocks):
 
     Parameters
     ----------
-    rocks : tuple(str)
-        Tuple of strings, with each string giving the rock layout of a different row of the dish.
+    rocks : tuple(int)
+        The packed rock layout, as given by get_input.
 
     Returns
     -------
-    rocks : tuple(str)
-        The rock layout after the rocks have settled following the cycle of tilts of the dish.
+    rocks : tuple(int)
+        The packed rock layout after the rocks have settled following the cycle of tilts of the
+        dish.
 
     """
-    # For each direction in order
-    for direction in ['N', 'W', 'S', 'E']:
-        # Tilt the dish and find the new rock layout
-        rocks = roll_rocks(rocks, direction)
-
-    return rocks
+    # Unpack the layout once for the whole cycle
+    round_rocks, cube_rocks, width, height = rocks
+    # Find all positions on the dish which aren't cubic rocks
+    free = ((1 << width*height) - 1) & ~cube_rocks
+    # Tilt the dish in each direction in order, North, West, South, East
+    round_rocks = tilt_lower(round_rocks, free, width)
+    round_rocks = tilt_lower(round_rocks, free, 1)
+    round_rocks = tilt_higher(round_rocks, free, width)
+    round_rocks = tilt_higher(round_rocks, free, 1)
+
+    return (round_rocks, cube_rocks, width, height)
 
 @time_function
 def Day14_Part2(input_file: str='Inputs/Day14_Inputs.txt') -> int:
@@ -227,21 +285,24 @@ def Day14_Part2(input_file: str='Inputs/Day14_Inputs.txt') -> int:
     rocks = get_input(input_file)
     # Start at zero cycles
     cycles = 0
-    # Create a dictionary of the rock layout obtained after each number of cycles
-    rock_dict = {}
+    # Create a dictionary of the number of cycles after which each rock layout was obtained, and a
+    # list of the rock layouts in order. The cubic rocks never move, so each layout is identified
+    # by the packed layout of the round rocks alone, which is much quicker to hash
+    seen, layouts = {}, []
     # While we have not seen the current layout before, i.e. no loop has been found yet
-    while rocks not in rock_dict.values():
-        # Add the current layout to the rock_dict
-        rock_dict[cycles] = rocks
+    while rocks[0] not in seen:
+        # Add the current layout to the seen layouts
+        seen[rocks[0]] = cycles
+        layouts.append(rocks)
         # Perform a single cycle on the rocks
         rocks = cycle_rocks(rocks)
         # Increment cycle counter
         cycles += 1
 
-    # Once we find a match in rock_dict with the current rock layout, we have found a loop which
-    # will repeat forever:
-    # Find the index of the matched rock layout in rock_dict
-    repeat = (list(rock_dict.keys())[list(rock_dict.values()).index(rocks)])
+    # Once we find a match in seen with the current rock layout, we have found a loop which will
+    # repeat forever:
+    # Find the number of cycles after which the matched rock layout was first seen
+    repeat = seen[rocks[0]]
     print(f'Found Match: Cycle {cycles} matches Cycle {repeat}')
 
     # Find the length of the loop
@@ -249,7 +310,7 @@ def Day14_Part2(input_file: str='Inputs/Day14_Inputs.txt') -> int:
     # Find the number of cycles left after an integer number of these loops from this point
     remainder = (1000000000 - repeat)%loop_length
     # Extract the layout correposnding to that many cycles into the loop
-    final_layout = rock_dict[remainder+repeat]
+    final_layout = layouts[remainder+repeat]
     # Calculate the corresponding load
     load = rock_load(final_layout)
 
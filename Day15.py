@@ -1,4 +1,5 @@
 from time import perf_counter
+from pathlib import Path
 
 def time_function(func):
     """
@@ -34,10 +35,8 @@ def get_input(input_file: str='Inputs/Day15_Inputs.txt') -> list:
         List of instruction strings.
 
     """
-    # Parse input file
-    with open(input_file) as f:
-        # Extract line and split into list by commas
-        strings = f.readlines()[0].strip().split(',')
+    # Read the whole input file at once and split into list by commas
+    strings = Path(input_file).read_text().strip().split(',')
 
     return strings
 
@@ -64,15 +63,52 @@ def HASH(string):
     """
     # Start current_value at zero
     current_value = 0
-    # Loop through string
-    for char in string:
-        # Find ASCII code of current character
-        current_value += ord(char)
-        # Execute the rest of the algorithm
-        current_value = (17*current_value)%256
+    # Loop through the ASCII codes of the characters in the string
+    for code in string.encode():
+        # Execute the algorithm, masking to the lowest 8 bits to find the remainder
+        current_value = 17*(current_value + code) & 255
 
     return current_value
 
+import numpy as np
+
+def hash_strings(strings):
+    """
+    Calculates the hashes of a list of strings all at once, according to the same algorithm as
+    HASH. The strings are right-aligned in a 2D array of ASCII codes, padded with zeros on the left,
+    which leaves the current value at zero, and then each step of the algorithm is applied to a
+    whole column of characters at a time. The current values are stored as 8 bit integers so the
+    remainder of dividing by 256 is found automatically.
+
+    Parameters
+    ----------
+    strings : list(str)
+        The strings to find the hashes of.
+
+    Returns
+    -------
+    hashes : numpy.1darray(uint8)
+        The final hash values of the given strings.
+
+    """
+    # Find the length of each string and where each one starts in the joined strings
+    lengths = np.array([len(string) for string in strings])
+    starts = np.cumsum(lengths) - lengths
+    # Find the row and column of each character in the right-aligned 2D array
+    rows = np.repeat(np.arange(len(strings)), lengths)
+    cols = np.arange(lengths.sum()) - np.repeat(starts - lengths.max() + lengths, lengths)
+    # Fill in the ASCII codes of every character
+    chars = np.zeros((len(strings), lengths.max()), dtype=np.uint8)
+    chars[rows, cols] = np.frombuffer(''.join(strings).encode(), dtype=np.uint8)
+
+    # Start current values at zero
+    hashes = np.zeros(len(strings), dtype=np.uint8)
+    # Loop through the columns of characters, executing the algorithm for every string at once
+    for col in chars.T:
+        hashes = (hashes + col)*np.uint8(17)
+
+    return hashes
+
 @time_function
 def Day15_Part1(input_file: str='Inputs/Day15_Inputs.txt') -> int:
     """
@@ -101,7 +137,7 @@ def Day15_Part1(input_file: str='Inputs/Day15_Inputs.txt') -> int:
     strings = get_input(input_file)
 
     # Calculate hash of each string and sum
-    hash_sum = sum(HASH(string) for string in strings)
+    hash_sum = int(hash_strings(strings).sum())
 
     return hash_sum
 
@@ -145,42 +181,36 @@ def Day15_Part2(input_file: str='Inputs/Day15_Inputs.txt') -> int:
     """
     # Parse input file and extract list of instructions
     strings = get_input(input_file)
-    # Start with 256 empty boxes
-    boxes = {n: [] for n in range(256)}
+    # Start with 256 empty boxes, each a dictionary of the focal length of each lens keyed by its
+    # label, which keeps the lenses in the order they were added
+    boxes = [{} for _ in range(256)]
+    # Extract the label of every instruction, which is everything before the operation character,
+    # where '-' instructions always end with the '-'
+    labels = [string[:-1] if string[-1] == '-' else string[:string.index('=')]
+              for string in strings]
+    # The same few labels are used over and over, so calculate the HASH of each distinct label
+    # only once, all at once, and look up the box each instruction operates on
+    unique_labels = list(dict.fromkeys(labels))
+    label_boxes = dict(zip(unique_labels, hash_strings(unique_labels).tolist()))
+    box_nums = [label_boxes[label] for label in labels]
     # Loop through strings
-    for string in strings:
+    for string, label, box_num in zip(strings, labels, box_nums):
         # For '-' instructions
-        if '-' in string:
-            # Extract the label
-            label = string[:-1]
-            # Find the HASH of the label
-            box_num = HASH(label)
-            # Find the index in that box of a matching label
-            box_ind = [i for i in range(len(boxes[box_num])) if boxes[box_num][i][0] == label]
-            # If a match exists, remove the corresponding lens, else do nothing
-            if box_ind:
-                boxes[box_num].pop(box_ind[0])
+        if string[-1] == '-':
+            # Remove the lens with that label from its box, if it is there, else do nothing
+            boxes[box_num].pop(label, None)
         # For '=' instructions
-        elif '=' in string:
-            # Extract label and focal length
-            label, focal_len = string.split('=')
-            # Find the HASH of the label
-            box_num = HASH(label)
-            # Find the index in that box of a matching label
-            box_ind = [i for i in range(len(boxes[box_num])) if boxes[box_num][i][0] == label]
-            # If a match exists, replace with the new focal length
-            if box_ind:
-                boxes[box_num][box_ind[0]] = (label, int(focal_len))
-            # Else add this one to the back of the box
-            else:
-                boxes[box_num].append((label, int(focal_len)))
+        else:
+            # Set the focal length of the lens with that label in its box, which replaces a lens
+            # with the same label in place, or else adds the lens to the back of the box
+            boxes[box_num][label] = int(string[len(label) + 1:])
 
     # Sum up focusing power
     total_focusing_power = 0
     # For each box
-    for n, box in boxes.items():
+    for n, box in enumerate(boxes):
         # For each lens in that box
-        for i, (label, focal_length) in enumerate(box):
+        for i, focal_length in enumerate(box.values()):
             # Calculate focusing power and add to sum
             total_focusing_power += (n+1)*(i+1)*focal_length
     
@@ -20,6 +20,11 @@ def time_function(func):
 
 import numpy as np
 
+# Define the integer code of each type of tile: empty space (0), \ and / mirrors (1 and 2), and
+# | and - splitters (3 and 4), as a lookup table indexed by character code
+TILE_CODES = np.zeros(256, dtype=np.int8)
+TILE_CODES[[ord(c) for c in '.\\/|-']] = np.arange(5)
+
 def get_input(input_file: str='Inputs/Day16_Inputs.txt') -> list:
     """
     Extracts the layout of a square grid of mirrors and beam splitters from an input file.
@@ -32,38 +37,98 @@ def get_input(input_file: str='Inputs/Day16_Inputs.txt') -> list:
 
     Returns
     -------
-    grid : numpy.2darray(char)
-        2D numpy array of characters representing the contents of each grid position.
+    grid : numpy.2darray(int8)
+        2D numpy array of integer codes representing the contents of each grid position.
 
     """
     # Parse input file
-    with open(input_file) as f:
-        # Extract lines and convert to numpy array
-        grid = np.array([[c for c in l.strip()] for l in f.readlines()])
+    with open(input_file, 'rb') as f:
+        # Extract lines as bytes
+        rows = f.read().splitlines()
+    # Convert to 2D numpy array of character codes, then look up the integer code of each tile
+    grid = TILE_CODES[np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1)]
 
     return grid
 
-import operator
-
-def add_tuple(a, b):
+# Define the code of the border of tiles added around the outside of the grid, which beams stop at
+EDGE = 5
+# Directions of travel are numbered north (0), east (1), south (2) and west (3)
+# Define the new direction of a beam after reflecting off each type of mirror, indexed by the
+# direction it was travelling in before. For \ mirrors the direction in each axis swaps around,
+# and for / mirrors it swaps around and then flips direction
+REFLECT_BACKSLASH = (3, 2, 1, 0)
+REFLECT_SLASH = (1, 0, 3, 2)
+# Define the direction(s) a beam leaves each type of tile in, indexed by the tile code and the
+# direction the beam entered the tile in, as (tile_code << 2) | direction. Beams continue in the
+# same direction through empty tiles and the pointy ends of splitters, while beams hitting the
+# flat side of | or - splitters split into beams moving up and down, or right and left
+NEW_DIRS = tuple((d,) for d in range(4))\
+         + tuple((REFLECT_BACKSLASH[d],) for d in range(4))\
+         + tuple((REFLECT_SLASH[d],) for d in range(4))\
+         + tuple((0, 2) if d & 1 else (d,) for d in range(4))\
+         + tuple((d,) if d & 1 else (1, 3) for d in range(4))
+
+def count_energised(grid, start_row: int, start_col: int, start_dir: int) -> int:
     """
-    Adds two tuples elementwise.
+    Counts the number of energised tiles in a 2D grid of mirrors and beam splitters when a beam
+    enters the grid at a given tile, travelling in a given direction. Each beam state is encoded
+    as a single integer, ((row*width + col) << 2) | direction, so no tuples have to be built or
+    hashed, and the states reached so far are recorded in one byte per tile, with one bit set for
+    each direction a beam has entered that tile in. The beam is followed depth first using a stack
+    of states still to be moved, and a tile is energised if any of its bits are set. Positions are
+    indexed in a copy of the grid padded with a border of edge tiles, so each move is a fixed step
+    in tile index and a beam leaving the grid is found with a single lookup.
 
     Parameters
     ----------
-    a : tuple(int)
-        First tuple.
-    b : tuple(int)
-        Second tuple.
+    grid : numpy.2darray(int8)
+        2D numpy array of integer codes representing the contents of each grid position.
+    start_row : int
+        Row of the first tile the beam enters.
+    start_col : int
+        Column of the first tile the beam enters.
+    start_dir : int
+        Direction number the beam is travelling in as it enters the first tile.
 
     Returns
     -------
-    tuple(int)
-        Result of elementwise addition of given tuples.
+    num_energised : int
+        The number of energised tiles after the beam has bounced around every part of its path.
 
     """
-    # Map addition operator onto tuples
-    return tuple(map(operator.add, a, b))
+    # Surround the grid with a border of edge tiles, so a beam leaving the grid is found from the
+    # code of the tile it moves into, and flatten it into bytes, so the code of each tile can be
+    # found by its index (row*width + col) in the padded grid
+    tiles = np.pad(grid, 1, constant_values=EDGE).tobytes()
+    width = grid.shape[1] + 2
+    # Find the step in tile index of each direction of travel
+    steps = (-width, 1, width, -1)
+    # Initialise the direction bits of the beams which have reached each tile
+    reached = bytearray(len(tiles))
+    # Start with the beam entering the first tile
+    start_tile = (start_row + 1)*width + start_col + 1
+    reached[start_tile] = 1 << start_dir
+    stack = [(start_tile << 2) | start_dir]
+    # While there are moving beams
+    while stack:
+        # Take the most recently reached beam state and decode the tile and direction of the beam
+        state = stack.pop()
+        tile, direction = state >> 2, state & 3
+        # For each direction the beam leaves this tile in
+        for new_dir in NEW_DIRS[(tiles[tile] << 2) | direction]:
+            # Find new location of beam, ignoring it if it is out of the grid
+            new_tile = tile + steps[new_dir]
+            if tiles[new_tile] != EDGE:
+                # If no beam has entered this tile in this direction before, set its bit and add
+                # the state to the stack
+                if not reached[new_tile] >> new_dir & 1:
+                    reached[new_tile] |= 1 << new_dir
+                    stack.append((new_tile << 2) | new_dir)
+
+    # Count the tiles visited by the beam in any direction
+    num_energised = len(tiles) - reached.count(0)
+
+    return num_energised
 
 @time_function
 def Day16_Part1(input_file: str='Inputs/Day16_Inputs.txt') -> int:
@@ -105,72 +170,134 @@ def Day16_Part1(input_file: str='Inputs/Day16_Inputs.txt') -> int:
     """
     # Parse input file and extract grid layout
     grid = get_input(input_file)
-    # Start with the beam entering the top right corner of the grid from the left
-    beams = {((0, -1), (0, 1))}
-    # Initialise set of searched beam states (location, direction)
-    searched = set()
-    # While there are moving beams
-    while beams:
-        # Initialise new set of beams after one step of movement from current states
-        new_beams = set()
-        # For each current beam state
-        for loc, direction in beams:
-            # Find new location of beam
-            new_loc = add_tuple(loc, direction)
-            # If the new location is out of the grid, just add the beam state to searched and
-            # do not consider it any further
-            if any(p < 0 for p in new_loc) or new_loc[0] >= len(grid) or new_loc[1] >= len(grid[0]):
-                searched.add((loc, direction))
-                continue
-            # For \ mirrors, reflection causes direction in each axis to swap around
-            if grid[new_loc] == '\\':
-                new_dir = (direction[1], direction[0])
-                # If not searched this state before, add it to new_beams
-                if (new_beam := (new_loc, new_dir)) not in searched:
-                    new_beams.add(new_beam)
-            # For \ mirrors, reflection causes direction in each axis to swap around and then
-            # flip direction (multiply by -1)
-            elif grid[new_loc] == '/':
-                new_dir = (-direction[1], -direction[0])
-                # If not searched this state before, add it to new_beams
-                if (new_beam := (new_loc, new_dir)) not in searched:
-                    new_beams.add(new_beam)
-            # For | splitters, if the beam is travelling horizontally then add two new beams,
-            # one moving down from here and one moving up
-            elif grid[new_loc] == '|' and direction[1]:
-                # If not searched this state before, add it to new_beams
-                if (new_beam1 := (new_loc, (-1, 0))) not in searched:
-                    new_beams.add(new_beam1)
-                # If not searched this state before, add it to new_beams
-                if (new_beam2 := (new_loc, (1, 0))) not in searched:
-                    new_beams.add(new_beam2)
-            # For - splitters, if the beam is travelling vertically then add two new beams,
-            # one moving left from here and one moving right
-            elif grid[new_loc] == '-' and direction[0]:
-                # If not searched this state before, add it to new_beams
-                if (new_beam1 := (new_loc, (0, -1))) not in searched:
-                    new_beams.add(new_beam1)
-                # If not searched this state before, add it to new_beams
-                if (new_beam2 := (new_loc, (0, 1))) not in searched:
-                    new_beams.add(new_beam2)
-            # If beam was moving in the wrong direction for a splitter, or is on an empty tile,
-            # just move to the next position and add to new beams if not searched before
-            elif (new_beam := (new_loc, direction)) not in searched:
-                new_beams.add(new_beam)
-            # Add this beam state to searched
-            searched.add((loc, direction))
-        # Set beams to the new set of beams and continue the loop
-        beams = new_beams.copy()
-
-    # Find set of every unique tile visited by the beam in any direction
-    energised = {b[0] for b in searched}
-
-    # Find length of energised tiles set (-1 to remove start position outside grid)
-    num_energised = len(energised) - 1
+
+    # Count energised tiles with the beam entering the top left corner of the grid, moving east
+    num_energised = count_energised(grid, 0, 0, 1)
     
     return num_energised
 
-from tqdm import tqdm
+def count_energised_from_starts(grid, starts: list) -> list:
+    """
+    Counts the number of energised tiles in a 2D grid of mirrors and beam splitters for each of a
+    list of starting beam states, sharing the work between every start. Beam states are encoded as
+    single integers, ((row*width + col) << 2) | direction, and form a graph where each state leads
+    to the one or two states the beam moves into next. This graph is searched depth first using
+    Tarjan's algorithm, which finds each strongly connected component (a set of states which can
+    all reach each other, such as a loop of beams) only after every component reachable from it.
+    The tiles energised from a component can then be stored as one integer bitmask, combining the
+    tiles of its own states with the masks already found for every state they lead into, and the
+    number of tiles energised from each start is the number of bits set in the mask of its state.
+
+    Parameters
+    ----------
+    grid : numpy.2darray(int8)
+        2D numpy array of integer codes representing the contents of each grid position.
+    starts : list(tuple(int))
+        List of starting beam states, in the form (row, col, direction), of the first tile each
+        beam enters and the direction number it is travelling in as it enters.
+
+    Returns
+    -------
+    num_energised : list(int)
+        The number of energised tiles from each starting state.
+
+    """
+    # Surround the grid with a border of edge tiles, so a beam leaving the grid is found from the
+    # code of the tile it moves into, and flatten it into bytes, so the code of each tile can be
+    # found by its index (row*width + col) in the padded grid
+    tiles = np.pad(grid, 1, constant_values=EDGE).tobytes()
+    width = grid.shape[1] + 2
+    # Find the step in tile index of each direction of travel
+    steps = (-width, 1, width, -1)
+
+    def next_states(state: int) -> list:
+        """
+        Finds the beam states a beam moves into next from a given state, ignoring any which leave
+        the grid.
+
+        """
+        tile, direction = state >> 2, state & 3
+        new_states = []
+        # For each direction the beam leaves this tile in
+        for new_dir in NEW_DIRS[(tiles[tile] << 2) | direction]:
+            # Find new location of beam, keeping it if it is in the grid
+            new_tile = tile + steps[new_dir]
+            if tiles[new_tile] != EDGE:
+                new_states.append((new_tile << 2) | new_dir)
+        return new_states
+
+    # Initialise the order each state is found in the search (0 for not found yet), the earliest
+    # found state each state can reach which is still unassigned to a component, and the mask of
+    # tiles energised from each state (0 until its component is complete)
+    order = [0]*(len(tiles)*4)
+    lowest = [0]*(len(tiles)*4)
+    energised = [0]*(len(tiles)*4)
+    # Initialise the stack of states not yet assigned to a component, and flags for which states
+    # are on it
+    unassigned = []
+    is_unassigned = bytearray(len(tiles)*4)
+    num_found = 0
+    # For each starting state
+    for row, col, direction in starts:
+        start = (((row + 1)*width + col + 1) << 2) | direction
+        # If it has already been searched from another start, move on
+        if order[start]:
+            continue
+        # Start a new search from this state, storing the path of states being searched along
+        # with an iterator of the states each one leads into
+        num_found += 1
+        order[start] = lowest[start] = num_found
+        unassigned.append(start)
+        is_unassigned[start] = 1
+        path = [(start, iter(next_states(start)))]
+        # While there are states on the path
+        while path:
+            state, new_states = path[-1]
+            # For each state this one leads into
+            for new_state in new_states:
+                # If it has not been found yet, add it to the path and search from it first
+                if not order[new_state]:
+                    num_found += 1
+                    order[new_state] = lowest[new_state] = num_found
+                    unassigned.append(new_state)
+                    is_unassigned[new_state] = 1
+                    path.append((new_state, iter(next_states(new_state))))
+                    break
+                # Else if it is unassigned, it is part of the same component as this state
+                elif is_unassigned[new_state]:
+                    lowest[state] = min(lowest[state], order[new_state])
+            # If every state this one leads into has been searched
+            else:
+                # Remove it from the path, and pass the earliest state it can reach to the state
+                # which led to it
+                path.pop()
+                if path:
+                    prev_state = path[-1][0]
+                    lowest[prev_state] = min(lowest[prev_state], lowest[state])
+                # If it cannot reach any state found before it which is still unassigned, it is
+                # the first state found in a complete component, made up of every unassigned
+                # state found after it
+                if lowest[state] == order[state]:
+                    component = [unassigned.pop()]
+                    while component[-1] != state:
+                        component.append(unassigned.pop())
+                    # Combine the tiles of every state in the component and the masks of every
+                    # state they lead into, where states in the component itself are still 0
+                    mask = 0
+                    for c_state in component:
+                        is_unassigned[c_state] = 0
+                        mask |= 1 << (c_state >> 2)
+                        for new_state in next_states(c_state):
+                            mask |= energised[new_state]
+                    # Set the mask of every state in the component
+                    for c_state in component:
+                        energised[c_state] = mask
+
+    # Count the tiles energised from each starting state
+    num_energised = [energised[(((row + 1)*width + col + 1) << 2) | direction].bit_count()
+                     for row, col, direction in starts]
+
+    return num_energised
 
 def Day16_Part2(input_file: str='Inputs/Day16_Inputs.txt') -> int:
     """
@@ -215,84 +342,20 @@ def Day16_Part2(input_file: str='Inputs/Day16_Inputs.txt') -> int:
     # Parse input file and extract grid layout
     grid = get_input(input_file)
 
-    # Create list of possible starting states, outisde the grid and travelling in:
+    height, width = grid.shape
+
+    # Create list of possible starting states (row, col, direction) of the first tile entered:
     # From the top
-    possible_starts = [((-1, col), (1, 0)) for col in range(len(grid[0]))]
+    possible_starts = [(0, col, 2) for col in range(width)]
     # From the bottom
-    possible_starts += [((len(grid), col), (-1, 0)) for col in range(len(grid[0]))]
+    possible_starts += [(height - 1, col, 0) for col in range(width)]
     # From the left
-    possible_starts += [((row, -1), (0, 1)) for row in range(len(grid))]
+    possible_starts += [(row, 0, 1) for row in range(height)]
     # From the right
-    possible_starts += [((row, len(grid[0])), (0, -1)) for row in range(len(grid))]
-
-    # Initialise list of the number of energised tile for each starting position
-    num_energised = []
-
-    # For each starting position
-    for start in tqdm(possible_starts):
-        # Start at the current starting position
-        beams = {start}
-        # Initialise set of searched beam states (location, direction)
-        searched = set()
-        # While there are moving beams
-        while beams:
-            # Initialise new set of beams after one step of movement from current states
-            new_beams = set()
-            # For each current beam state
-            for loc, direction in beams:
-                # Find new location of beam
-                new_loc = add_tuple(loc, direction)
-                # If the new location is out of the grid, just add the beam state to searched and
-                # do not consider it any further
-                if any(p < 0 for p in new_loc) or new_loc[0] >= len(grid) or new_loc[1] >= len(grid[0]):
-                    searched.add((loc, direction))
-                    continue
-                # For \ mirrors, reflection causes direction in each axis to swap around
-                if grid[new_loc] == '\\':
-                    new_dir = (direction[1], direction[0])
-                    # If not searched this state before, add it to new_beams
-                    if (new_beam := (new_loc, new_dir)) not in searched:
-                        new_beams.add(new_beam)
-                # For \ mirrors, reflection causes direction in each axis to swap around and then
-                # flip direction (multiply by -1)
-                elif grid[new_loc] == '/':
-                    new_dir = (-direction[1], -direction[0])
-                    # If not searched this state before, add it to new_beams
-                    if (new_beam := (new_loc, new_dir)) not in searched:
-                        new_beams.add(new_beam)
-                # For | splitters, if the beam is travelling horizontally then add two new beams,
-                # one moving down from here and one moving up
-                elif grid[new_loc] == '|' and direction[1]:
-                    # If not searched this state before, add it to new_beams
-                    if (new_beam1 := (new_loc, (-1, 0))) not in searched:
-                        new_beams.add(new_beam1)
-                    # If not searched this state before, add it to new_beams
-                    if (new_beam2 := (new_loc, (1, 0))) not in searched:
-                        new_beams.add(new_beam2)
-                # For - splitters, if the beam is travelling vertically then add two new beams,
-                # one moving left from here and one moving right
-                elif grid[new_loc] == '-' and direction[0]:
-                    # If not searched this state before, add it to new_beams
-                    if (new_beam1 := (new_loc, (0, -1))) not in searched:
-                        new_beams.add(new_beam1)
-                    # If not searched this state before, add it to new_beams
-                    if (new_beam2 := (new_loc, (0, 1))) not in searched:
-                        new_beams.add(new_beam2)
-                # If beam was moving in the wrong direction for a splitter, or is on an empty tile,
-                # just move to the next position and add to new beams if not searched before
-                elif (new_beam := (new_loc, direction)) not in searched:
-                    new_beams.add(new_beam)
-                # Add this beam state to searched
-                searched.add((loc, direction))
-            # Set beams to the new set of beams and continue the loop
-            beams = new_beams.copy()
-
-        # Find set of every unique tile visited by the beam in any direction
-        energised = {b[0] for b in searched}
-        
-        # Find length of energised tiles set (-1 to remove start position outside grid) and add
-        # to list
-        num_energised.append(len(energised) - 1)
+    possible_starts += [(row, width - 1, 3) for row in range(height)]
+
+    # Find the number of energised tiles for each starting position
+    num_energised = count_energised_from_starts(grid, possible_starts)
 
     # Extract maximum number of energised tiles
     max_energised = max(num_energised)
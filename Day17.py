@@ -18,57 +18,201 @@ def time_function(func):
         return out
     return wrapper
 
-import operator
+import numpy as np
 
-def add_tuple(a, b):
+def get_input(input_file: str='Inputs/Day17_Inputs.txt') -> list:
     """
-    Adds two tuples elementwise.
+    Extracts a 2D heat loss map from an input file.
 
     Parameters
     ----------
-    a : tuple(int)
-        First tuple.
-    b : tuple(int)
-        Second tuple.
+    input_file : str, optional
+        Input file giving the heat loss map.
+        The default is 'Inputs/Day17_Inputs.txt'.
 
     Returns
     -------
-    tuple(int)
-        Result of elementwise addition of given tuples.
+    grid : numpy.2darray(uint8)
+        2D numpy array of integers giving the heat loss at each position on the map.
 
     """
-    # Map addition operator onto tuples
-    return tuple(map(operator.add, a, b))
+    # Parse input file
+    with open(input_file, 'rb') as f:
+        # Extract lines as bytes
+        rows = f.read().splitlines()
+    # Convert to 2D numpy array of character codes, and subtract the code of '0' to find the digits
+    grid = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1) - ord('0')
 
-import numpy as np
+    return grid
 
-def get_input(input_file: str='Inputs/Day17_Inputs.txt') -> list:
+# Directions of travel are numbered north (0), east (1), south (2) and west (3)
+# Define the heat loss of states which have not been reached yet
+INF = 1 << 30
+
+from heapq import heappop, heappush
+
+def heatlosses_to_end(grid: list, width: int, end: int) -> list:
     """
-    Extracts a 2D heat loss map from an input file.
+    Finds the minimum heat loss of a path from each position on a heat loss map to the bottom
+    right corner, ignoring any limits on the number of consecutive moves in the same direction,
+    using Dijkstra's algorithm backwards from the end. As the limits can only make a path longer,
+    these are lower bounds on the heat loss still to come from any state at each position, which
+    are used as the heuristic of an A* search.
 
     Parameters
     ----------
-    input_file : str, optional
-        Input file giving the heat loss map.
-        The default is 'Inputs/Day17_Inputs.txt'.
+    grid : list(int)
+        Heat loss at each tile index (row*width + col) of the heat loss map, padded with a border
+        of zeros.
+    width : int
+        Number of columns in the padded heat loss map.
+    end : int
+        Tile index of the bottom right corner.
 
     Returns
     -------
-    grid : numpy.2darray(int)
-        2D numpy array of integers giving the heat loss at each position on the map.
+    min_heatlosses : list(int)
+        The minimum heat loss from each tile index to the bottom right corner.
 
     """
-    # Parse input file
-    with open(input_file) as f:
-        # Extract lines and convert to numpy array of ints
-        grid = np.array([[int(n) for n in l.strip()] for l in f.readlines()])
+    # Initialise minimum heat loss to the end from each tile, starting at the end itself
+    min_heatlosses = [INF]*len(grid)
+    min_heatlosses[end] = 0
+    # Initialise queue using heap module, where each entry is packed into a single integer as
+    # (heat_loss << tile_bits) | tile, so the heap only has to compare plain integers
+    tile_bits = len(grid).bit_length()
+    tile_mask = (1 << tile_bits) - 1
+    queue = [end]
+    # While there are unsearched tiles
+    while queue:
+        # Remove the tile with the lowest heat loss, skipping it if a lower heat loss was found
+        # after it was queued
+        entry = heappop(queue)
+        hl, tile = entry >> tile_bits, entry & tile_mask
+        if hl > min_heatlosses[tile]:
+            continue
+        # For each neighbouring tile in the grid (not on the border of zeros), which reaches this
+        # tile by moving into it
+        for step in (-width, 1, width, -1):
+            prev_tile = tile + step
+            if grid[prev_tile]:
+                # If this gives a lower heat loss to the end from the neighbour, record it and
+                # add the neighbour to the queue
+                if (prev_hl := hl + grid[tile]) < min_heatlosses[prev_tile]:
+                    min_heatlosses[prev_tile] = prev_hl
+                    heappush(queue, (prev_hl << tile_bits) | prev_tile)
+
+    return min_heatlosses
+
+def find_min_heatloss(grid, min_straight: int, max_straight: int) -> int:
+    """
+    Finds the optimal path with minimal heat loss which can be taken through a grid, from the top
+    left to the bottom right, where the path must move at least a minimum number of times in the
+    same direction before it can turn or stop at the end, and at most a maximum number of times
+    before it must turn, and cannot go immediately backwards on itself at any point. Each state of
+    the path is packed into a single integer as
+    (((row*width + col) << 2) | last_direction)*(max_straight + 1) + num_straight_moves, and the
+    states are searched with A* using a bucket queue. Positions are indexed in a copy of the grid
+    padded with a border of zeros, so each move is a fixed step in tile index and a path leaving
+    the grid is found from the zero heat loss of the tile it moves into.
 
-    return grid
+    Parameters
+    ----------
+    grid : numpy.2darray(uint8)
+        2D numpy array of integers giving the heat loss at each position on the map.
+    min_straight : int
+        Minimum number of consecutive moves in the same direction before turning or stopping.
+    max_straight : int
+        Maximum number of consecutive moves in the same direction.
 
-from heapq import heappop, heappush
+    Returns
+    -------
+    min_heatloss : int
+        The minimum possible heat loss.
 
-# Define all orthogonal directions
-DIRECTIONS = {(0, 1), (0, -1), (1, 0), (-1, 0)}
+    """
+    # Surround the heat loss map with a border of zeros and flatten it to a list for quick lookup
+    # of the heat loss at each tile index (row*width + col) in the padded map
+    height, width = grid.shape[0] + 2, grid.shape[1] + 2
+    grid = np.pad(grid, 1).ravel().tolist()
+    # Find the step in tile index of each direction of travel
+    steps = (-width, 1, width, -1)
+    # Find the tile indices of the top left and bottom right corners
+    start, end = width + 1, (height - 1)*width - 2
+    # Find the number of possible numbers of straight moves in a state
+    num_straights = max_straight + 1
+
+    # Find the possible moves from a state with each number of straight moves, in the form
+    # (turn, new_num_straight), where the turn is added to the last direction to find the new one:
+    # straight on (0) if fewer than max_straight moves have been made in this direction, and
+    # turning right (1) or left (3) if at least min_straight moves have (can't go backwards)
+    moves = [([(0, n + 1)] if n < max_straight else [])\
+             + ([(1, 1), (3, 1)] if n >= min_straight else []) for n in range(num_straights)]
+
+    # Find a lower bound on the heat loss still to come from each position, ignoring the limits on
+    # moving straight
+    to_end = heatlosses_to_end(grid, width, end)
+
+    # Initialise flat list of minimum heat loss to reach each packed state. Start at the top left
+    # corner of the grid, accounting for both possible directions entering the grid at this point
+    # (east and south)
+    min_heatlosses = [INF]*(height*width*4*num_straights)
+    start_states = [((start << 2) | 1)*num_straights, ((start << 2) | 2)*num_straights]
+    for state in start_states:
+        min_heatlosses[state] = 0
+
+    # Initialise a bucket queue to search the states in order of their priority, which is their
+    # heat loss plus the lower bound on the heat loss still to come, where each bucket is a list of
+    # packed states. A move between two tiles increases the priority by between 0 and the sum of
+    # their heat losses, at most 18, so the queued states only ever span 19 consecutive priorities
+    # and the bucket for priority f can be reused for f + 19
+    buckets = [[] for _ in range(19)]
+    # Start searching from the priority of the top left corner
+    f = to_end[start]
+    buckets[f % 19] += start_states
+    # Initialise the minimum heat loss as not found yet
+    min_heatloss = None
+    # While the end has not been reached and there are unsearched states
+    while min_heatloss is None and any(buckets):
+        # Take the bucket of states with the current priority
+        bucket = buckets[f % 19]
+        # While there are unsearched states with this priority
+        while bucket:
+            # Remove an unsearched state, and decode its position, last direction and number of
+            # straight moves
+            state = bucket.pop()
+            tile_dir, num_straight = divmod(state, num_straights)
+            tile, last_dir = tile_dir >> 2, tile_dir & 3
+            # Find the heat loss of the state from its priority, and if a lower heat loss to this
+            # state was found after it was queued, skip this entry
+            hl = f - to_end[tile]
+            if hl > min_heatlosses[state]:
+                continue
+            # If this is an end state at the bottom right corner, having moved at least
+            # min_straight moves in the same direction before stopping, the heuristic guarantees
+            # no other path can reach the end with lower heat loss, so stop searching
+            if tile == end and num_straight >= min_straight:
+                min_heatloss = hl
+                break
+            # For each possible move from this state
+            for turn, new_num_straight in moves[num_straight]:
+                # Find new direction and position
+                direction = (last_dir + turn) & 3
+                new_tile = tile + steps[direction]
+                # If the new position is outside the grid, ignore it and move on
+                if not grid[new_tile]:
+                    continue
+                # If this path gives lower heat loss to the new state than the recorded value, set
+                # it to the new value and add the state to the bucket for its priority
+                new_state = ((new_tile << 2) | direction)*num_straights + new_num_straight
+                new_hl = hl + grid[new_tile]
+                if new_hl < min_heatlosses[new_state]:
+                    min_heatlosses[new_state] = new_hl
+                    buckets[(new_hl + to_end[new_tile]) % 19].append(new_state)
+        # Move on to the next priority
+        f += 1
+
+    return min_heatloss
 
 @time_function
 def Day17_Part1(input_file: str='Inputs/Day17_Inputs.txt') -> int:
@@ -94,56 +238,8 @@ def Day17_Part1(input_file: str='Inputs/Day17_Inputs.txt') -> int:
     # Parse input file and extract heat loss map
     grid = get_input(input_file)
 
-    # Start at top left corner of the grid
-    pos = (0, 0)
-    # Initialise dict of minimum heat loss to reach each position in each state, where each state
-    # is in the form (position, last_direction, number_of_straight_moves). Account for both
-    # possible directions entering the grid at this point (right and down)
-    min_heatlosses = {(pos, (0, 1), 0): 0, (pos, (1, 0), 0): 0}
-
-    # Initialise queue using heap module to prioritise the shortest path still not searched
-    queue = [(0, (pos, (0, 1), 0)), (0, (pos, (1, 0), 0))]
-    # While there are unsearched states
-    while queue:
-        # Remove the highest priority unsearched state and extract parameters
-        hl, state = heappop(queue)
-        pos, last_dir, num_straight = state
-        # Start with all possible directions
-        possible_dirs = DIRECTIONS.copy()
-        # Remove the opposite of the last direction travelled in (can't go backwards)
-        possible_dirs.discard((-last_dir[0], -last_dir[1]))
-        # If we have moved at least 3 moves in the same direction, remove this direction as well
-        if num_straight >= 3:
-            possible_dirs.discard(last_dir)
-        # For each possible direction of travel
-        for direction in possible_dirs:
-            # Find new position
-            new_pos = add_tuple(pos, direction)
-            # If the new position is outside the grid, ignore it and move on
-            if any(p < 0 for p in new_pos) or new_pos[0] >= len(grid) or new_pos[1] >= len(grid[0]):
-                continue
-            # If we are travelling in the same direction as last time, add 1 to num_straight
-            if direction == last_dir:
-                new_num_straight = num_straight + 1
-            # Else reset to 1
-            else:
-                new_num_straight = 1
-            # If the corresponding new state has not been found yet (in min_heatlosses), set its
-            # minimum heat loss to the current value and add it to the queue to search
-            if (new_state := (new_pos, direction, new_num_straight)) not in min_heatlosses:
-                min_heatlosses[new_state] = min_heatlosses[state] + grid[new_state[0]]
-                heappush(queue, (min_heatlosses[new_state], new_state))
-            # Else if it is already in min_heatlosses so has already been searched, but this path
-            # gives lower heat loss than the recorded value, set it to the new value
-            elif min_heatlosses[state] + grid[new_state[0]] < min_heatlosses[new_state]:
-                min_heatlosses[new_state] = min_heatlosses[state] + grid[new_state[0]]
-
-    # Extract the heat loss to every end state at the bottom right corner
-    possible_heatloss = [d for state, d in min_heatlosses.items()\
-                      if state[0] == (len(grid)-1, len(grid[0])-1)]
-
-    # Find minimum heat loss
-    min_heatloss = min(possible_heatloss)
+    # Find minimum heat loss, moving between 1 and 3 times in the same direction at a time
+    min_heatloss = find_min_heatloss(grid, 1, 3)
 
     return min_heatloss
 
@@ -173,61 +269,7 @@ def Day17_Part2(input_file: str='Inputs/Day17_Inputs.txt') -> int:
     # Parse input file and extract heat loss map
     grid = get_input(input_file)
 
-    # Start at top left corner of the grid
-    pos = (0, 0)
-    # Initialise dict of minimum heat loss to reach each position in each state, where each state
-    # is in the form (position, last_direction, number_of_straight_moves). Account for both
-    # possible directions entering the grid at this point (right and down)
-    min_heatlosses = {(pos, (0, 1), 0): 0, (pos, (1, 0), 0): 0}
-
-    # Initialise queue using heap module to prioritise the shortest path still not searched
-    queue = [(0, (pos, (0, 1), 0)), (0, (pos, (1, 0), 0))]
-    # While there are unsearched states
-    while queue:
-        # Remove the highest priority unsearched state and extract parameters
-        hl, state = heappop(queue)
-        pos, last_dir, num_straight = state
-        # If the number of straight moves is less than 4, have to continue in the same direction
-        if num_straight < 4:
-            possible_dirs = {last_dir}
-        else:
-            # Else start with all possible directions
-            possible_dirs = DIRECTIONS.copy()
-            # Remove the opposite of the last direction travelled in (can't go backwards)
-            possible_dirs.discard((-last_dir[0], -last_dir[1]))
-            # If we have moved at least 10 moves in the same direction, remove this direction too
-            if num_straight >= 10:
-                possible_dirs.discard(last_dir)
-        # For each possible direction of travel
-        for direction in possible_dirs:
-            # Find new position
-            new_pos = add_tuple(pos, direction)
-            # If the new position is outside the grid, ignore it and move on
-            if any(p < 0 for p in new_pos) or new_pos[0] >= len(grid) or new_pos[1] >= len(grid[0]):
-                continue
-            # If we are travelling in the same direction as last time, add 1 to num_straight
-            if direction == last_dir:
-                new_num_straight = num_straight + 1
-            # Else reset to 1
-            else:
-                new_num_straight = 1
-            # If the corresponding new state has not been found yet (in min_heatlosses), set its
-            # minimum heat loss to the current value and add it to the queue to search
-            if (new_state := (new_pos, direction, new_num_straight)) not in min_heatlosses:
-                min_heatlosses[new_state] = min_heatlosses[state] + grid[new_state[0]]
-                heappush(queue, (min_heatlosses[new_state], new_state))
-            # Else if it is already in min_heatlosses so has already been searched, but this path
-            # gives lower heat loss than the recorded value, set it to the new value
-            elif min_heatlosses[state] + grid[new_state[0]] < min_heatlosses[new_state]:
-                min_heatlosses[new_state] = min_heatlosses[state] + grid[new_state[0]]
-
-    # Extract the heat loss to every end state at the bottom right corner, with at least 4 moves in
-    # the same direction before stopping
-    possible_heatloss = [d for state, d in min_heatlosses.items()\
-                      if state[0] == (len(grid)-1, len(grid[0])-1)\
-                          and state[2] >= 4]
-
-    # Find minimum heat loss
-    min_heatloss = min(possible_heatloss)
+    # Find minimum heat loss, moving between 4 and 10 times in the same direction at a time
+    min_heatloss = find_min_heatloss(grid, 4, 10)
 
     return min_heatloss
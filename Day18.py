@@ -1,8 +1,13 @@
 from time import perf_counter
+import os
+
+# Only time functions when the AOC_TIMING environment variable is set to 1
+TIMING = os.environ.get('AOC_TIMING') == '1'
 
 def time_function(func):
     """
-    Decorator function to measure runtime of given function.
+    Decorator function to measure runtime of given function, if timing is enabled. Otherwise the
+    function is returned unchanged, so it can be called repeatedly without any overhead or output.
 
     Parameters
     ----------
@@ -10,6 +15,8 @@ def time_function(func):
         Function to time.
 
     """
+    if not TIMING:
+        return func
     def wrapper(*args, **kwargs):
         t1 = perf_counter()
         out = func(*args, **kwargs)
@@ -18,6 +25,11 @@ def time_function(func):
         return out
     return wrapper
 
+# Map of direction symbols onto vectors
+DIRECTIONS = {'U': (-1, 0), 'R': (0, 1), 'D': (1, 0), 'L': (0, -1)}
+# Direction vectors of the expanded dig plan, indexed by direction digit
+DIGIT_DIRECTIONS = (DIRECTIONS['R'], DIRECTIONS['D'], DIRECTIONS['L'], DIRECTIONS['U'])
+
 def get_input(input_file: str='Inputs/Day18_Inputs.txt', expand: bool=False) -> list:
     """
     Extract the dig plan for a lagoon from an input file in the form (direction, distance, colour),
@@ -38,30 +50,72 @@ def get_input(input_file: str='Inputs/Day18_Inputs.txt', expand: bool=False) ->
     Returns
     -------
     plan : list
-        Extracted dig plan in the form (direction, distance, colour).
+        Extracted dig plan in the form (direction, distance, colour), or if expanded in the form
+        (direction vector, distance).
 
     """
+    # Parse input file and extract lines
+    with open(input_file, 'rb') as f:
+        lines = f.read().splitlines()
 
-    dir_dict = {'0': 'R', '1': 'D', '2': 'L', '3': 'U'}
-    # Parse input file
-    with open(input_file) as f:
+    plan = []
+    for l in lines:
+        d, n, col = l.split()
         if expand:
-            # Extract lines and format
-            lines = [l.strip().split()[-1].strip('()#') for l in f.readlines()]
             # If expanding, split the hexadecimal and convert to base 10
-            plan = [(dir_dict[l[-1]], int(l[:-1], base=16)) for l in lines]
+            col = col.strip(b'()#')
+            plan.append((DIGIT_DIRECTIONS[col[-1] - ord('0')], int(col[:-1], base=16)))
         else:
-            # Extract lines and format
-            lines = [l.strip().split() for l in f.readlines()]
-            plan = [(l[0], int(l[1]), l[2].strip('()')) for l in lines]
+            plan.append((d.decode(), int(n), col.strip(b'()').decode()))
 
     return plan
 
-# Map of direction symbols onto vectors
-DIRECTIONS = {'U': (-1, 0), 'R': (0, 1), 'D': (1, 0), 'L': (0, -1)}
-
 import numpy as np
 
+def dig_volume(plan: list) -> int:
+    """
+    Determines how many cubic meters of lava could be held in a lagoon which is dug according to
+    a plan of (direction, distance) instructions. Only the corners of the lagoon boundary are
+    found, then the shoelace theorem gives the area enclosed by the boundary and Pick's theorem
+    gives the number of points inside it, so no grid of the lagoon has to be built.
+
+    Parameters
+    ----------
+    plan : list(tuple(tuple(int), int))
+        Dig plan in the form (direction vector, distance).
+
+    Returns
+    -------
+    volume : int
+        Volume of the lagoon.
+
+    """
+    # Extract the direction vector and distance of each instruction in the dig plan
+    dirs = np.array([d for d, n in plan], dtype=np.int64).reshape(-1, 2)
+    dists = np.array([n for d, n in plan], dtype=np.int64)
+    # Find coordinates defining the corners of the lagoon boundary, as the cumulative sum of the
+    # steps of the dig plan, starting from (0, 0)
+    outline = np.zeros((len(plan) + 1, 2), dtype=np.int64)
+    np.cumsum(dirs*dists[:, None], axis=0, out=outline[1:])
+
+    # Use the shoelace theorem to find the area enclosed by the boundary, taking the products of the
+    # coordinates of each pair of consecutive corners all at once as two dot products
+    left_sum = np.dot(outline[:-1, 0], outline[1:, 1])
+    right_sum = np.dot(outline[:-1, 1], outline[1:, 0])
+
+    area = int(abs(left_sum - right_sum))//2
+
+    # The number of points in the outline is the total distance dug
+    edge_points = int(dists.sum())
+
+    # Use Pick's theorem to find the number of internal points, and add the outline points to find
+    # the volume of the lagoon
+    volume = area + edge_points//2 + 1
+
+    return volume
+
+from collections import deque
+
 @time_function
 def Day18_Part1(input_file: str='Inputs/Day18_Inputs.txt') -> int:
     """
@@ -84,52 +138,8 @@ def Day18_Part1(input_file: str='Inputs/Day18_Inputs.txt') -> int:
     # Parse input file to extract lagoon dig plan
     plan = get_input(input_file)
 
-    # Find coordinates defining boundary of the lagoon
-    outline = [(0, 0)]
-    # Loop through dig plan
-    for d, n, col in plan:
-        for i in range(n):
-            # Add each new coordinate
-            outline.append((outline[-1][0]+DIRECTIONS[d][0], outline[-1][1]+DIRECTIONS[d][1]))
-
-    # Find minimum coordinate of outline in both axis
-    min_coords = [min(p[i] for p in outline) for i in range(2)]
-    # Shift every coordinate so there is at least one row above the outline and one column to the
-    # left (empty space all around the outline)
-    outline = [(p[0] - min_coords[0] + 1, p[1] - min_coords[1] + 1) for p in outline]
-
-    # Initialise grid of the area including the lagoon, starting as all ones
-    grid = np.ones([max(p[i] for p in outline) + 2 for i in range(2)], dtype=int)
-    # Set all outline points to 2
-    for p in outline:
-        grid[p] = 2
-
-    # Set the top left corner (outside the grid) to 0
-    grid[(0, 0)] = 0
-
-    # Use breadth-first search to find all points outside the lagoon outline
-    queue = [(0, 0)]
-    # WHile there are points left to check
-    while queue:
-        # Remove oldest point in queue
-        pos = queue.pop(0)
-        # Check in each direction from the current point
-        for d in DIRECTIONS.values():
-            # Find the new coordinate
-            new_pos = (pos[0]+d[0], pos[1]+d[1])
-            # If this is outside the bounds of the area, skip
-            if any(p < 0 for p in new_pos) or new_pos[0] >= len(grid) or new_pos[1] >= len(grid[0]):
-                continue
-            # Else if this point wasn't checked yet (still at 1), set to 0 and add pos to queue
-            if grid[new_pos] == 1:
-                grid[new_pos] = 0
-                queue.append(new_pos)
-    
-    # Set all outline points to 1
-    grid[grid == 2] = 1
-
-    # Sum up all points still in the lagoon
-    volume = np.sum(grid)
+    # Find the volume of the lagoon from the direction and distance of each instruction
+    volume = dig_volume([(DIRECTIONS[d], n) for d, n, col in plan])
     
     return volume
 
@@ -158,27 +168,9 @@ def Day18_Part2_Shoelace(input_file: str='Inputs/Day18_Inputs.txt') -> int:
     """
     # Parse input file to extract expanded lagoon dig plan
     plan = get_input(input_file, expand=True)
-    
-    # Find coordinates defining the corners of the lagoon boundary
-    outline = [(0, 0)]
-    # Loop through dig plan
-    for d, n in plan:
-        # Add each corner coordinate
-        outline.append((outline[-1][0]+DIRECTIONS[d][0]*n, outline[-1][1]+DIRECTIONS[d][1]*n))
-
-    # Use the shoelace theorem to find the area enclosed by the boundary
-    left_sum = sum(outline[i][0]*outline[i+1][1] for i in range(len(outline)-1))
-    right_sum = sum(outline[i][1]*outline[i+1][0] for i in range(len(outline)-1))
-    
-    area = abs(left_sum - right_sum)/2
-
-    # Use Pick's theorem to find the number of points in the outline
-    edge_points = sum(abs(outline[i][0] - outline[i+1][0]) + abs(outline[i][1] - outline[i+1][1]) \
-                     for i in range(len(outline) - 1))
 
-    # Combine values to find the volume of the lagoon
-    total_internal_points = int(area + 1 - edge_points/2)
-    volume = total_internal_points + edge_points
+    # Find the volume of the lagoon using the shoelace and Pick's theorems
+    volume = dig_volume(plan)
 
     return volume
 
@@ -209,90 +201,75 @@ def Day18_Part2(input_file: str='Inputs/Day18_Inputs.txt') -> int:
     plan = get_input(input_file, expand=True)
     
     # Find coordinates defining the corners of the lagoon boundary
-    outline = [(0, 0)]
+    y, x = 0, 0
+    outline = [(y, x)]
     # Loop through dig plan
-    for d, n in plan:
+    for (dy, dx), n in plan:
         # Add each corner coordinate
-        outline.append((outline[-1][0]+DIRECTIONS[d][0]*n, outline[-1][1]+DIRECTIONS[d][1]*n))
+        y, x = y + dy*n, x + dx*n
+        outline.append((y, x))
 
     # Old method - I forgot how it works, but it does
-    v_divs = {p[0] for p in outline}
-    v_divs.add(min(v_divs)-1)
-    v_divs.add(max(v_divs)+1)
-    h_divs = {p[1] for p in outline}
-    h_divs.add(min(h_divs)-1)
-    h_divs.add(max(h_divs)+1)
-    
-    v_divs = sorted(list(v_divs))
-    h_divs = sorted(list(h_divs))
+    v_divs = sorted({p[0] for p in outline})
+    h_divs = sorted({p[1] for p in outline})
+    # Add a division either side of the outline, taking the extremes from the ends of the sorted
+    # divisions
+    v_divs = [v_divs[0]-1] + v_divs + [v_divs[-1]+1]
+    h_divs = [h_divs[0]-1] + h_divs + [h_divs[-1]+1]
+    # Map each division onto its position in the sorted divisions
+    v_idx = {c: i for i, c in enumerate(v_divs)}
+    h_idx = {c: i for i, c in enumerate(h_divs)}
     
-    outline_set = set()
+    # Mark which sections have the outline running along their right and bottom sides
+    right_wall = np.zeros((len(v_divs) - 1, len(h_divs) - 1), dtype=bool)
+    bottom_wall = np.zeros((len(v_divs) - 1, len(h_divs) - 1), dtype=bool)
     for i in range(len(outline) - 1):
         # Horizontal line
         if outline[i][0] == outline[i+1][0]:
-            first_ind = h_divs.index(outline[i][1])
-            last_ind = h_divs.index(outline[i+1][1])
-            for j in range(min(first_ind, last_ind), max(first_ind, last_ind)):
-                outline_set.add(((outline[i][0], h_divs[j]), (outline[i][0], h_divs[j+1])))
+            first_ind, last_ind = sorted((h_idx[outline[i][1]], h_idx[outline[i+1][1]]))
+            bottom_wall[v_idx[outline[i][0]]-1, first_ind:last_ind] = True
     
         # Vertical line
         if outline[i][1] == outline[i+1][1]:
-            first_ind = v_divs.index(outline[i][0])
-            last_ind = v_divs.index(outline[i+1][0])
-            for j in range(min(first_ind, last_ind), max(first_ind, last_ind)):
-                outline_set.add(((v_divs[j], outline[i][1]), (v_divs[j+1], outline[i][1])))
+            first_ind, last_ind = sorted((v_idx[outline[i][0]], v_idx[outline[i+1][0]]))
+            right_wall[first_ind:last_ind, h_idx[outline[i][1]]-1] = True
         
-    outside = {(0, 0)}
-
-    queue = [(0, 0)]
+    # Find which moves between neighbouring sections aren't blocked by the outline, or by the edge
+    # of the sections, as lists of lists for fast indexing
+    open_right = np.zeros_like(right_wall)
+    open_right[:, :-1] = ~right_wall[:, :-1]
+    open_left = np.zeros_like(right_wall)
+    open_left[:, 1:] = open_right[:, :-1]
+    open_down = np.zeros_like(bottom_wall)
+    open_down[:-1] = ~bottom_wall[:-1]
+    open_up = np.zeros_like(bottom_wall)
+    open_up[1:] = open_down[:-1]
+    # Pair each direction vector with where moves in that direction are open
+    moves = tuple(zip(DIGIT_DIRECTIONS, (open_right.tolist(), open_down.tolist(),
+                                         open_left.tolist(), open_up.tolist())))
+
+    outside = np.zeros(right_wall.shape, dtype=bool).tolist()
+    outside[0][0] = True
+
+    queue = deque([(0, 0)])
     while queue:
-        section = queue.pop(0)
-        top_left = (v_divs[section[0]], h_divs[section[1]])
-        top_right = (v_divs[section[0]], h_divs[section[1]+1])
-        bottom_left = (v_divs[section[0]+1], h_divs[section[1]])
-        bottom_right = (v_divs[section[0]+1], h_divs[section[1]+1])
-        outside_dirs = []
-        if not (top_right, bottom_right) in outline_set:
-            outside_dirs.append('R')
-        if not (bottom_left, bottom_right) in outline_set:
-            outside_dirs.append('D')
-        if not (top_left, bottom_left) in outline_set:
-            outside_dirs.append('L')
-        if not (top_left, top_right) in outline_set:
-            outside_dirs.append('U')
-        for d in outside_dirs:
-            new_section = (section[0]+DIRECTIONS[d][0], section[1]+DIRECTIONS[d][1])
-            if any(p < 0 for p in new_section)\
-                or new_section[0] >= len(v_divs) - 1 or new_section[1] >= len(h_divs) - 1:
-                continue
-            if new_section not in outside:
-                outside.add(new_section)
-                queue.append(new_section)
-    
-    volume = 0
-    for v in range(len(v_divs) - 1):
-        for h in range(len(h_divs) - 1):
-            section = (v, h)
-            top_left = (v_divs[section[0]], h_divs[section[1]])
-            top_right = (v_divs[section[0]], h_divs[section[1]+1])
-            bottom_left = (v_divs[section[0]+1], h_divs[section[1]])
-            bottom_right = (v_divs[section[0]+1], h_divs[section[1]+1])
-            # right side
-            if (top_right, bottom_right) in outline_set:
-                h_side = h_divs[h+1] - h_divs[h] + 1
-            else:
-                h_side = h_divs[h+1] - h_divs[h]
-            # bottom side
-            if (bottom_left, bottom_right) in outline_set:
-                v_side = v_divs[v+1] - v_divs[v] + 1
-            else:
-                v_side = v_divs[v+1] - v_divs[v]
-            if (v, h) not in outside:
-                volume += v_side*h_side
-                # bottom right
-                if (top_right, bottom_right) in outline_set and (bottom_left, bottom_right) in outline_set:
-                    volume -= 1
+        v, h = queue.popleft()
+        # Move into each neighbouring section which isn't separated from this one by the outline,
+        # and hasn't been reached already
+        for (dv, dh), is_open in moves:
+            if is_open[v][h]:
+                new_v, new_h = v + dv, h + dh
+                if not outside[new_v][new_h]:
+                    outside[new_v][new_h] = True
+                    queue.append((new_v, new_h))
+    outside = np.array(outside)
     
+    # Each section includes its right and bottom sides if they are part of the outline
+    h_sides = np.diff(np.array(h_divs, dtype=np.int64)) + right_wall
+    v_sides = np.diff(np.array(v_divs, dtype=np.int64))[:, None] + bottom_wall
+    # Sum the areas of all sections inside the outline, less the bottom right corner of those which
+    # include both sides
+    volume = int((v_sides*h_sides - (right_wall & bottom_wall))[~outside].sum())
     volume += 1
     
     return volume
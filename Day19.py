@@ -1,8 +1,13 @@
 from time import perf_counter
+import os
+
+# Only time functions when the AOC_TIMING environment variable is set to 1
+TIMING = os.environ.get('AOC_TIMING') == '1'
 
 def time_function(func):
     """
-    Decorator function to measure runtime of given function.
+    Decorator function to measure runtime of given function, if timing is enabled. Otherwise the
+    function is returned unchanged, so it can be called repeatedly without any overhead or output.
 
     Parameters
     ----------
@@ -10,6 +15,8 @@ def time_function(func):
         Function to time.
 
     """
+    if not TIMING:
+        return func
     def wrapper(*args, **kwargs):
         t1 = perf_counter()
         out = func(*args, **kwargs)
@@ -18,6 +25,11 @@ def time_function(func):
         return out
     return wrapper
 
+# Define the rating categories, in the order their values are stored
+RATINGS = 'xmas'
+# Define the IDs of the starting workflow, and of accepting and rejecting a part
+IN, ACCEPT, REJECT = 0, -1, -2
+
 def get_input(input_file: str='Inputs/Day19_Inputs.txt') -> tuple:
     """
     Extract a series of workflows followed by a list of parts from an input file.
@@ -28,52 +40,6 @@ def get_input(input_file: str='Inputs/Day19_Inputs.txt') -> tuple:
         Input file giving the workflows and parts.
         The default is 'Inputs/Day19_Inputs.txt'.
 
-    Returns
-    -------
-    workflows : dict(str: list(tuple(str) or str))
-        Dict mapping the name of each workflow into a list of the rules it specifies.
-    parts : list(dict(str: int))
-        List of parts as dicts mapping each rating category to its value.
-
-    """
-    workflows, parts = {}, []
-    # Parse input file and extract lines
-    with open(input_file) as f:
-        lines = [l.strip() for l in f.readlines()]
-
-    i = 0
-    # Until first newline, extract and format workflows
-    while lines[i]:
-        split = lines[i].index('{')
-        workflows[lines[i][:split]] = [tuple(r.split(':')) if ':' in r else r \
-                                       for r in lines[i][split:].strip('{}').split(',')]
-        i += 1
-    i += 1
-    # Then extract and format parts
-    while i < len(lines):
-        parts.append({p.split('=')[0]: int(p.split('=')[1]) \
-                      for p in lines[i].strip('{}').split(',')})
-        i += 1
-
-    return workflows, parts
-
-def process_workflow(workflow: list, part: dict) -> str:
-    """
-    Determine the where a given part is sent after passing through a given workflow. Each part is
-    rated in each of four categories: x, m, a and s. Each workflow will either accept or reject the
-    part or send it to a different workflow. Each workflow has a name and contains a list of rules;
-    each rule specifies a condition and where to send the part if the condition is true. The first
-    rule that matches the part being considered is applied immediately, and the part moves on to
-    the destination described by the rule. (The last rule in each workflow has no condition and
-    always applies if reached.)
-
-    Parameters
-    ----------
-    workflow : list(tuple(str) or str)
-        List of the rules specified by the given workflow.
-    part : dict(str: int)
-        Parts as a dict mapping each rating category to its value.
-
     Raises
     ------
     Exception
@@ -81,31 +47,58 @@ def process_workflow(workflow: list, part: dict) -> str:
 
     Returns
     -------
-    dest : str
-        Where the part is sent by this workflow.
+    workflows : list(list(tuple(int, int, int, int)))
+        List of the rules specified by each workflow, indexed by workflow ID, where 'in' has the ID
+        IN. Each rule is pre-parsed into a tuple of the form (rating, op, limit, dest), where
+        rating is the index of the rating category in RATINGS, op is 0 for '>', 1 for '<' and 2
+        for an unconditional rule, in which case the rating is None and the limit is 0, and dest is
+        the ID of the workflow the rule sends parts to, or ACCEPT or REJECT.
+    parts : list(tuple(int))
+        List of parts as tuples of their values in each rating category, in the order of RATINGS.
 
     """
-    # Loop through rules in order
-    for rule in workflow:
-        # If this rule has a condition
-        if isinstance(rule, tuple):
-            cond, dest = rule
-            # Apply corresponding condition
-            if '>' in cond:
-                p, lim = cond.split('>')
-                # If passed, send the part to the correpsonding destination
-                if part[p] > int(lim):
-                    return dest
-            elif '<' in cond:
-                p, lim = cond.split('<')
-                # If passed, send the part to the correpsonding destination
-                if part[p] < int(lim):
-                    return dest
+    parts = []
+    # Parse input file and extract lines
+    with open(input_file) as f:
+        lines = f.read().splitlines()
+
+    # The workflows are given up to the first empty line
+    num_workflows = lines.index('')
+    # Give each workflow an integer ID, with 'in' first
+    names = sorted((l[:l.index('{')] for l in lines[:num_workflows]), key=lambda n: n != 'in')
+    ids = {name: i for i, name in enumerate(names)}
+    ids['A'], ids['R'] = ACCEPT, REJECT
+
+    # Extract and format workflows
+    workflows = [None]*num_workflows
+    for line in lines[:num_workflows]:
+        split = line.index('{')
+        rules = []
+        for r in line[split:].strip('{}').split(','):
+            # If this rule has a condition, parse it once into its rating, operator and limit
+            if ':' in r:
+                cond, dest = r.split(':')
+                if '>' in cond:
+                    p, lim = cond.split('>')
+                    rules.append((RATINGS.index(p), 0, int(lim), ids[dest]))
+                elif '<' in cond:
+                    p, lim = cond.split('<')
+                    rules.append((RATINGS.index(p), 1, int(lim), ids[dest]))
+                else:
+                    raise Exception(f"Unknown condition {cond} in workflow {line[:split]}!")
             else:
-                raise Exception(f"Unknown condition {cond} in workflow {workflow} for part {part}!")
-        else:
-            # Else just send the part to this unconditional destination
-            return rule
+                # Else the rule always sends parts to its destination
+                rules.append((None, 2, 0, ids[r]))
+        workflows[ids[line[:split]]] = rules
+
+    # Then extract and format parts
+    for line in lines[num_workflows+1:]:
+        ratings = dict(p.split('=') for p in line.strip('{}').split(','))
+        parts.append(tuple(int(ratings[p]) for p in RATINGS))
+
+    return workflows, parts
+
+import numpy as np
 
 @time_function
 def Day19_Part1(input_file: str='Inputs/Day19_Inputs.txt') -> int:
@@ -114,6 +107,14 @@ def Day19_Part1(input_file: str='Inputs/Day19_Inputs.txt') -> int:
     file that ultimately get accepted after passing through a series of workflows given in the same
     input file. The rating of a part is the sum of its four values x, m, a and s.
 
+    Each workflow will either accept or reject the part or send it to a different workflow. Each
+    workflow has a name and contains a list of rules; each rule specifies a condition and where to
+    send the part if the condition is true. The first rule that matches the part being considered
+    is applied immediately, and the part moves on to the destination described by the rule. (The
+    last rule in each workflow has no condition and always applies if reached.) All of the parts
+    are passed through the workflows together as a batch, applying each rule to every part waiting
+    at that workflow at once.
+
     Parameters
     ----------
     input_file : str, optional
@@ -128,93 +129,114 @@ def Day19_Part1(input_file: str='Inputs/Day19_Inputs.txt') -> int:
     """
     # Parse input file tp extract workflows and parts
     workflows, parts = get_input(input_file)
-
-    # Track accepted and rejected parts
-    final_state = {'A': [], 'R': []}
-    # Loop through parts
-    for part in parts:
-        # Always start by applying the 'in' workflow
-        dest = process_workflow(workflows['in'], part)
-        # Until the part is accepted or rejected
-        while dest not in ['A', 'R']:
-            # Keep passing the part through each workflow it is sent to
-            dest = process_workflow(workflows[dest], part)
-
-        # Track if the part was accepted or rejected
-        final_state[dest].append(part)
+    # Store all parts in one array, with a row per part and a column per rating
+    parts = np.array(parts, dtype=np.int64).reshape(-1, 4)
+
+    # Order the workflows reachable from 'in' so that each one comes after every workflow which can
+    # send parts to it, using a depth-first search, so each workflow only has to be applied once
+    order, seen = [], {IN, ACCEPT, REJECT}
+    stack = [(IN, iter(workflows[IN]))]
+    while stack:
+        wf, rules = stack[-1]
+        for rule in rules:
+            if rule[3] not in seen:
+                seen.add(rule[3])
+                stack.append((rule[3], iter(workflows[rule[3]])))
+                break
+        else:
+            # Once every destination of this workflow is ordered, add it before them
+            order.append(stack.pop()[0])
+
+    # Track which parts are accepted
+    accepted = np.zeros(len(parts), dtype=bool)
+    # Track the indices of the parts waiting at each workflow, always starting at 'in'
+    waiting = {IN: np.arange(len(parts))}
+    for wf in reversed(order):
+        # Skip workflows which no parts are sent to
+        if (idxs := waiting.pop(wf, None)) is None:
+            continue
+        # Loop through the rules of this workflow in order, while any parts are left
+        for p, op, lim, dest in workflows[wf]:
+            # Find which of the remaining parts pass this rule
+            if op == 2:
+                passed = np.ones(len(idxs), dtype=bool)
+            elif op == 0:
+                passed = parts[idxs, p] > lim
+            else:
+                passed = parts[idxs, p] < lim
+            # Send these parts to the destination of the rule
+            if dest == ACCEPT:
+                accepted[idxs[passed]] = True
+            elif dest != REJECT:
+                waiting[dest] = np.concatenate((waiting.get(dest, idxs[:0]), idxs[passed]))
+            # Continue with the parts which didn't pass, if any
+            idxs = idxs[~passed]
+            if not len(idxs):
+                break
 
     # Sum ratings for all accepted parts
-    ratings = sum(sum(p.values()) for p in final_state['A'])
+    ratings = int(parts[accepted].sum())
 
     return ratings
 
 def split_dests(workflows, part_locs):
     """
     Find where a series of parts are sent after passing through given workflows, based on the range
-    of values which the ratings of the parts can have.
+    of values which the ratings of the parts can have. The ranges of all four ratings are stored
+    together in one flat tuple, so each rule only has to rebuild the tuple around the one bound it
+    changes, and any range left with no values in it is dropped instead of being passed on.
 
     Parameters
     ----------
-    workflows : dict(str: list(tuple(str) or str))
-        Dict mapping the name of each workflow into a list of the rules it specifies.
-    part_locs : list(tuple(str, dict(str: tuple(int, int))))
-        List of part locations, where each location is a tuple with the workflow name the part is
-        currently in and a dict mapping each rating onto a tuple giving the range of values which
-        are currently at this workflow in the form (low, high).
-
-    Raises
-    ------
-    Exception
-        If an unknown condition is encountered in a rule.
+    workflows : list(list(tuple(int, int, int, int)))
+        List of the rules specified by each workflow, indexed by workflow ID, as
+        (rating, op, limit, dest) tuples.
+    part_locs : list(tuple(int, tuple(int)))
+        List of part locations, where each location is a tuple with the workflow ID the part is
+        currently in and a tuple giving the range of values of each rating which are currently at
+        this workflow, in the form (x_low, x_high, m_low, m_high, a_low, a_high, s_low, s_high),
+        where the bounds are exclusive.
 
     Returns
     -------
-    parts_out : list(tuple(str, dict(str: tuple(int, int))))
-        New list of part locations, where each location is a tuple with the workflow name the part
-        is currently in and a dict mapping each rating onto a tuple giving the range of values
-        which are currently at this workflow in the form (low, high).
+    parts_out : list(tuple(int, tuple(int)))
+        New list of part locations, where each location is a tuple with the workflow ID the part is
+        currently in, or ACCEPT or REJECT, and a tuple giving the range of values of each rating
+        which are currently at this workflow, in the same form.
 
     """
     # Start new list of part locations
     parts_out = []
     # Loop through workflows and part ranges in that workflow
-    for wf, parts_in in part_locs:
+    for wf, ranges in part_locs:
         # Loop through rules of that workflow
-        for rule in workflows[wf]:
-            # If the rule is conditional
-            if isinstance(rule, tuple):
-                cond, dest = rule
-                if '>' in cond:
-                    p, lim = cond.split('>')
-                    # Move the range of parts ratings which satisfy the condition to the
-                    # corresponding workflow
-                    parts_out.append((dest, {param:(int(lim), lims[1]) if param == p \
-                                             else (lims[0], lims[1]) \
-                                                 for param, lims in parts_in.items()}))
-                    # Reduce the part range to the remaining values which didn't satsify this rule
-                    parts_in = {param:(lims[0], int(lim)+1) if param == p else (lims[0], lims[1]) \
-                                for param, lims in parts_in.items()}
-                elif '<' in cond:
-                    p, lim = cond.split('<')
-                    # Move the range of parts ratings which satisfy the condition to the
-                    # corresponding workflow
-                    parts_out.append((dest, {param:(lims[0], int(lim)) if param == p \
-                                             else (lims[0], lims[1]) \
-                                                 for param, lims in parts_in.items()}))
-                    # Reduce the part range to the remaining values which didn't satsify this rule
-                    parts_in = {param:(int(lim)-1, lims[1]) if param == p else (lims[0], lims[1]) \
-                                for param, lims in parts_in.items()}
-                else:
-                    raise Exception(f"Unknown condition {cond}")
+        for p, op, lim, dest in workflows[wf]:
+            # If the rule is unconditional, move all remaining part ranges to its destination
+            if op == 2:
+                parts_out.append((dest, ranges))
+                break
+            # Find the position of the low bound of this rating in the ranges
+            i = 2*p
+            if op == 0:
+                # Move the range of parts ratings which satisfy the condition to the
+                # corresponding workflow, if there are any
+                if ranges[i+1] - (low := max(ranges[i], lim)) > 1:
+                    parts_out.append((dest, ranges[:i] + (low,) + ranges[i+1:]))
+                # Reduce the part range to the remaining values which didn't satsify this rule
+                ranges = ranges[:i+1] + (min(ranges[i+1], lim+1),) + ranges[i+2:]
             else:
-                # Else move all remaining part ranges to this unconditional destination
-                parts_out.append((rule, parts_in))
+                # Move the range of parts ratings which satisfy the condition to the
+                # corresponding workflow, if there are any
+                if (high := min(ranges[i+1], lim)) - ranges[i] > 1:
+                    parts_out.append((dest, ranges[:i+1] + (high,) + ranges[i+2:]))
+                # Reduce the part range to the remaining values which didn't satsify this rule
+                ranges = ranges[:i] + (max(ranges[i], lim-1),) + ranges[i+1:]
+            # If there are no values left which didn't satisfy any rule so far, stop
+            if ranges[i+1] - ranges[i] <= 1:
+                break
     
     return parts_out
 
-from functools import reduce
-import operator
-
 @time_function
 def Day19_Part2(input_file: str='Inputs/Day19_Inputs.txt') -> int:
     """
@@ -238,9 +260,9 @@ def Day19_Part2(input_file: str='Inputs/Day19_Inputs.txt') -> int:
     # Start with every possible combination going into 'in'
     # Rpresent part ranges as ranges of values taken by each of the ratings, and track which
     # workflow each part range is currently at
-    part_locs = [('in', {'x':(0, 4001), 'm':(0, 4001), 'a':(0, 4001), 's':(0, 4001)})]
+    part_locs = [(IN, (0, 4001)*4)]
     # Count states which are accepted or rejected
-    final_state = {'A': 0, 'R': 0}
+    final_state = {ACCEPT: 0, REJECT: 0}
 
     # While there are states in workflows which aren't 'A' or 'R'
     while part_locs:
@@ -251,15 +273,16 @@ def Day19_Part2(input_file: str='Inputs/Day19_Inputs.txt') -> int:
         # Loop through locations of part ranges
         for dest, parts in new_part_locs:
             # If they are accepted or rejected
-            if dest in ['A', 'R']:
+            if dest < 0:
                 # Add the number of combinations (product of the four rating ranges) to the total
-                final_state[dest] += reduce(operator.mul, [lims[1] - lims[0] - 1 \
-                                                           for lims in parts.values()])
+                x_low, x_high, m_low, m_high, a_low, a_high, s_low, s_high = parts
+                final_state[dest] += (x_high - x_low - 1)*(m_high - m_low - 1) \
+                                     *(a_high - a_low - 1)*(s_high - s_low - 1)
             else:
                 # Else add these parts ranges to the new list and continue processing
                 part_locs.append((dest, parts))
 
     # Find the final number of accepted states
-    num_comb = final_state['A']
+    num_comb = final_state[ACCEPT]
 
     return num_comb
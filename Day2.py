@@ -1,7 +1,8 @@
-def get_input(input_file: str='Inputs/Day2_Inputs.txt') -> list:
+def get_input(input_file: str='Inputs/Day2_Inputs.txt', max_cubes: dict=None) -> list:
     """
-    Extracts the number of occurences of each colour of cube, for every set of cubes revealed from
-    a bag in a game, for a series of different games, which are detailled in an input file.
+    Extracts the maximum number of occurences of each colour of cube, across every set of cubes
+    revealed from a bag in a game, for a series of different games, which are detailled in an
+    input file.
 
     Parameters
     ----------
@@ -10,35 +11,40 @@ def get_input(input_file: str='Inputs/Day2_Inputs.txt') -> list:
         Game 11: ...) followed by a semicolon-separated list of subsets of cubes that were
         revealed from the bag (like 3 red, 5 green, 4 blue).
         The default is 'Inputs/Day2_Inputs.txt'.
+    max_cubes : dict(str: int), optional
+        If given, the number of cubes of each colour in the bag. Any game which reveals more cubes
+        of a colour than this is impossible, so the rest of it is skipped and it is left out.
+        The default is None.
 
     Returns
     -------
-    all_games : dict(int: dict(str: list(int)))
-        Extracted occurences of each colour of cube, in each set, in every game.
+    all_games : dict(int: dict(str: int))
+        Extracted maximum occurences of each colour of cube, across all sets, in every game.
 
     """
     # Parse input file
     with open(input_file) as f:
-        lines = [l.strip() for l in f.readlines()]
+        lines = f.read().splitlines()
         # Create empty games dict
         all_games = {}
         for line in lines:
             game_id, cube_sets = line.split(': ')
             # Extract game ID number
             game_id = int(game_id.split()[-1])
-            # Split up cube_sets
-            cube_sets = cube_sets.split('; ')
             # Create empty dict for each cube colour for the current game ID
-            all_games[game_id] = {}
-            for cube_set in cube_sets:
-                # For each colour cube in each game
-                for cube in cube_set.split(', '):
-                    num, colour = cube.split()
-                    # Fill dict with list of number of cubes of each colour in each set
-                    if colour in all_games[game_id]:
-                        all_games[game_id][colour].append(int(num))
-                    else:
-                        all_games[game_id][colour] = [int(num)]
+            game = all_games[game_id] = {}
+            # For each colour cube in every set in the game
+            for cube in cube_sets.replace('; ', ', ').split(', '):
+                num, colour = cube.split()
+                num = int(num)
+                # If there aren't that many cubes of this colour in the bag, the game is impossible
+                # so drop it without parsing the rest
+                if max_cubes is not None and num > max_cubes.get(colour, 0):
+                    del all_games[game_id]
+                    break
+                # Track the max number of cubes of each colour seen in any set
+                if colour not in game or num > game[colour]:
+                    game[colour] = num
 
     return all_games
 
@@ -69,23 +75,17 @@ def Day2_Part1(input_file: str='Inputs/Day2_Inputs.txt',
         the bag.
 
     """
-    # Parse input file to get the occurences of each colour across all sets in each game
-    all_games = get_input(input_file)
-    # For each game
-    for game_id, game in all_games.items():
-        # For each cube colour
-        for colour, nums in game.items():
-            # Find the max number of cubes of that colour were observed
-            all_games[game_id][colour] = max(nums)
-
-    # Find every game where the highest number of cubes of every colour observed in less than or
-    # equal to the number given in the bag, sum the corresponding IDs
-    id_sum = sum(game_id for game_id, game in all_games.items()\
-                 if all(num <= max_cubes[colour] for colour, num in game.items()))
+    # Parse input file to get the max occurences of each colour across all sets in each game,
+    # keeping only games where every number of cubes observed is less than or equal to the number
+    # given in the bag
+    possible_games = get_input(input_file, max_cubes)
+
+    # Sum the IDs of the possible games
+    id_sum = sum(possible_games)
 
     return id_sum
 
-import numpy as np
+from math import prod
 
 def Day2_Part2(input_file: str='Inputs/Day2_Inputs.txt') -> int:
     """
@@ -108,17 +108,11 @@ def Day2_Part2(input_file: str='Inputs/Day2_Inputs.txt') -> int:
         The sum of the power of the minimum sets reqired to play each game.
 
     """
-    # Parse input file to get the occurences of each colour across all sets in each game
+    # Parse input file to get the max occurences of each colour across all sets in each game
     all_games = get_input(input_file)
-    # For each game
-    for game_id, game in all_games.items():
-        # For each cube colour
-        for colour, nums in game.items():
-            # Find the max number of cubes of that colour were observed
-            all_games[game_id][colour] = max(nums)
 
     # The minimum number of each coloured cube required is the maximum number observed, so find
     # the product of these values for each game, and then sum
-    power_sum = sum(np.product([num for num in game.values()]) for game in all_games.values())
+    power_sum = sum(prod(game.values()) for game in all_games.values())
 
     return power_sum
@@ -16,43 +16,41 @@ def get_input(input_file: str='Inputs/Day20_Inputs.txt', split_loops: bool=False
     Returns
     -------
     config : list or list of lists
-        If not split_loops, returns the parsed lines describing the module configuration. If
+        If not split_loops, returns the parsed lines describing the module configuration, as
+        tuples of each module name and a tuple of the names of its destination modules. If
         split_loops is True then returns the parsed lines but seperated into several lists, one
         for each independent loop.
 
     """
     # Parse input file and split module names and connections
+    config = []
     with open(input_file) as f:
-        config = [l.strip().split(' -> ') for l in f.readlines()]
+        for l in f.read().splitlines():
+            name, conn = l.split(' -> ')
+            config.append((name, tuple(conn.split(', '))))
 
     # If not splitting loops, we're done
     if not split_loops:
         return config
 
-    # Find the broadcaster
-    for i in range(len(config)):
-        if config[i][0] == 'broadcaster':
-            break
+    # Map each module name onto its line in the config
+    by_name = {l[0].lstrip('%&'): l for l in config}
 
-    # Extract it and use each of its connections to initiate a new loop
-    loops = [[['broadcaster', name]] for name in config.pop(i)[1].split(', ')]
+    # Extract the broadcaster and use each of its connections to initiate a new loop
+    loops = [[('broadcaster', (name,))] for name in by_name.pop('broadcaster')[1]]
     # Find the names of all the conjunction modules
-    conj = [l[0][1:] for l in config if l[0].startswith('&')]
+    conj = {name for name, l in by_name.items() if l[0].startswith('&')}
 
     # For each loop
     for loop in loops:
         # Starting with the connection from the broadcaster
-        next_mod = loop[-1][1]
+        next_mod = loop[-1][1][0]
         # While we haven't reached the conjunction module which closes the loop
         while not loop[-1][0].startswith('&'):
-            # Find the next module definition in the list
-            for i in range(len(config)):
-                if config[i][0][1:] == next_mod:
-                    break#
-            # Extract and add to the loop
-            loop.append(config.pop(i))
+            # Extract the next module definition and add to the loop
+            loop.append(by_name.pop(next_mod))
             # Find next connections
-            next_mods = loop[-1][1].split(', ')
+            next_mods = loop[-1][1]
             # If there is only 1 continue
             if len(next_mods) == 1:
                 next_mod = next_mods[0]
@@ -82,10 +80,10 @@ def extract_modules(config: list) -> tuple:
     -------
     modules : dict(str: int)
         Dict mapping each module name onto its enumerated type.
-    states : dict(str: int or dict(str: int) or list(int))
+    states : dict(str: int or dict(str: int))
         Dict mapping each module name into its state, which is an int for flip-flop modules, a dict
         mapping the name of every input module onto its remembered state for conjunction modules,
-        and a list of each input for untyped modules.
+        and 0 for untyped modules, which have no state.
     connected : dict(str: list(str))
         Dict mapping the name of every module onto the names of the modules it outputs to.
 
@@ -103,14 +101,14 @@ def extract_modules(config: list) -> tuple:
         if name.startswith('%'):
             modules[name[1:]] = 0
             states[name[1:]] = 0
-            connected[name[1:]] = conn.split(', ')
+            connected[name[1:]] = list(conn)
         elif name.startswith('&'):
             modules[name[1:]] = 1
             states[name[1:]] = dict()
-            connected[name[1:]] = conn.split(', ')
+            connected[name[1:]] = list(conn)
         elif name == 'broadcaster':
             modules[name] = 2
-            connected[name] = conn.split(', ')
+            connected[name] = list(conn)
 
     # Loop back through all connections
     for name, conn in connected.items():
@@ -119,7 +117,7 @@ def extract_modules(config: list) -> tuple:
             # module
             if c not in modules:
                 modules[c] = 3
-                states[c] = []
+                states[c] = 0
             # Else if this module outputs to a conjunction module, add it to the state of that
             # module
             elif modules[c] == 1:
@@ -127,7 +125,74 @@ def extract_modules(config: list) -> tuple:
 
     return modules, states, connected
 
-def push_button(modules: dict, states: dict, connected: dict,
+# ID given to the broadcaster module
+BROADCASTER = 0
+
+def intern_modules(modules: dict, states: dict, connected: dict) -> tuple:
+    """
+    Convert the types, states and connections of a series of modules, keyed by module name, into
+    lists indexed by an integer ID given to each module, so that a machine can be simulated without
+    hashing any module names. The broadcaster module is given the ID BROADCASTER. The memory of
+    each conjunction module is stored as a bitmask, with a bit for each of its inputs which is set
+    if it remembers a high pulse from that input.
+
+    Parameters
+    ----------
+    modules : dict(str: int)
+        Dict mapping each module name onto its enumerated type.
+    states : dict(str: int or dict(str: int))
+        Dict mapping each module name into its state, which is an int for flip-flop modules, a dict
+        mapping the name of every input module onto its remembered state for conjunction modules,
+        and 0 for untyped modules, which have no state.
+    connected : dict(str: list(str))
+        Dict mapping the name of every module onto the names of the modules it outputs to.
+
+    Returns
+    -------
+    ids : dict(str: int)
+        Dict mapping each module name onto its ID.
+    types : list(int)
+        Enumerated type of each module.
+    int_states : list(int or None)
+        State of each module, in the same form as before but with the memory of conjunction modules
+        given as a bitmask, or None for the broadcaster.
+    conn : list(list(tuple(int, int)))
+        Connections from each module, as the ID of the module it outputs to paired with the bit of
+        the source module in the memory of that module, which is 0 if it isn't a conjunction module.
+    full_masks : list(int)
+        Bitmask with every input bit set for each conjunction module, or 0 for other modules.
+
+    """
+    # Give each module an ID, in the order they were found but with the broadcaster first
+    order = sorted(modules, key=lambda name: name != 'broadcaster')
+    ids = {name: i for i, name in enumerate(order)}
+    types = [modules[name] for name in order]
+
+    int_states, full_masks, bits = [], [], {}
+    for name in order:
+        m = modules[name]
+        if m == 1:
+            # Give each input of a conjunction module its own bit, and set the bits of the inputs
+            # which are remembered as high
+            mask, full_mask = 0, 0
+            for i, (source, pulse) in enumerate(states[name].items()):
+                bits[source, name] = 1 << i
+                mask |= pulse << i
+                full_mask |= 1 << i
+            int_states.append(mask)
+            full_masks.append(full_mask)
+        else:
+            int_states.append(states.get(name))
+            full_masks.append(0)
+
+    # Index connections by ID, and pair each with the bit of its source at its destination
+    conn = [[(ids[c], bits.get((name, c), 0)) for c in connected.get(name, [])] for name in order]
+
+    return ids, types, int_states, conn, full_masks
+
+from collections import deque
+
+def push_button(types: list, states: list, conn: list, full_masks: list, start: int,
                 n_low: int=0, n_high: int=0) -> tuple:
     """
     Determines the number of low and high pulses which are sent after a button which sends a single
@@ -152,14 +217,19 @@ def push_button(modules: dict, states: dict, connected: dict,
 
     Parameters
     ----------
-    modules : dict(str: int)
-        Dict mapping each module name onto its enumerated type.
-    states : dict(str: int or dict(str: int) or list(int))
-        Dict mapping each module name into its state, which is an int for flip-flop modules, a dict
-        mapping the name of every input module onto its remembered state for conjunction modules,
-        and a list of each input for untyped modules.
-    connected : dict(str: list(str))
-        Dict mapping the name of every module onto the names of the modules it outputs to.
+    types : list(int)
+        Enumerated type of each module, indexed by module ID.
+    states : list(int or None)
+        State of each module, indexed by module ID, which is an int for flip-flop modules, a
+        bitmask of the inputs remembered as high for conjunction modules, and 0 for untyped
+        modules, which have no state.
+    conn : list(list(tuple(int, int)))
+        Connections from each module, indexed by module ID, as the ID of the module it outputs to
+        paired with the bit of the source module in the memory of that module.
+    full_masks : list(int)
+        Bitmask with every input bit set for each conjunction module, indexed by module ID.
+    start : int
+        ID of the broadcaster module.
     n_low : int, optional
         The number of low pulses to start with.
         The default is 0.
@@ -175,48 +245,38 @@ def push_button(modules: dict, states: dict, connected: dict,
         The new number of high pulses sent.
 
     """
-    # Reset inputs to untyped modules
-    for name, m in modules.items():
-        if m == 3:
-            states[name] = []
     # Add one low pulse for the button press
     n_low += 1
-    # Start a queue of pulses with each low pulse sent by the broadcaster
-    queue = [(0, c, 'broadcaster') for c in connected['broadcaster']]
+    # Start a queue of pulses with the low pulses sent by the broadcaster. Each module sends the
+    # same pulse to all of its destinations at once, so these are queued together as one entry
+    # of the pulse and the connections it is sent along, and processed in order
+    queue = deque([(0, conn[start])])
+    # Bind the queue methods to locals for the loop
+    append, popleft = queue.append, queue.popleft
     # While there are pulses left to be processed
     while queue:
-        # Extract the oldest one
-        pulse, mod, source = queue.pop(0)
+        # Extract the oldest ones
+        pulse, edges = popleft()
         # Increment corresponding counter
         if pulse == 0:
-            n_low += 1
+            n_low += len(edges)
         else:
-            n_high += 1
-        # For flip-flop modules
-        if modules[mod] == 0:
-            # If the pulse is high do nothing
-            if pulse > 0:
-                continue
-            # Else flip the state and output the new state
-            else:
-                states[mod] = (states[mod] + 1)%2
-                for c in connected[mod]:
-                    queue.append((states[mod], c, mod))
-        # For conjunction modules
-        elif modules[mod] == 1:
-            # Update the source module in memory
-            states[mod][source] = pulse
-            # If all input states are high output low
-            if all(states[mod].values()):
-                for c in connected[mod]:
-                   queue.append((0, c, mod))
-            # Else output high
-            else:
-                for c in connected[mod]:
-                   queue.append((1, c, mod))
-        # For untyped modules, record the input
-        elif modules[mod] == 3:
-            states[mod].append(pulse)
+            n_high += len(edges)
+        # Process the pulse at each destination in turn
+        for mod, bit in edges:
+            m = types[mod]
+            # For flip-flop modules
+            if m == 0:
+                # If the pulse is high do nothing, else flip the state and output the new state
+                if pulse == 0:
+                    state = states[mod] = states[mod] ^ 1
+                    append((state, conn[mod]))
+            # For conjunction modules
+            elif m == 1:
+                # Update the bit of the source module in memory
+                state = states[mod] = states[mod] | bit if pulse else states[mod] & ~bit
+                # If all input states are high output low, else output high
+                append((0 if state == full_masks[mod] else 1, conn[mod]))
 
     return n_low, n_high
 
@@ -245,7 +305,9 @@ def Day20_Part1(input_file: str='Inputs/Day20_Inputs.txt') -> int:
     """
     Calculates the result from multiplying the total number of low pulses sent by a series of
     modules, whose configuration is given in an input file, by the total number of high pulses
-    sent, after a button sending a low pulse to the broadcaster module is pressed 1000 times.
+    sent, after a button sending a low pulse to the broadcaster module is pressed 1000 times. If
+    the machine returns to an earlier state before then, the remaining presses are found from the
+    repeating cycle of pulses instead of being simulated.
 
     Parameters
     ----------
@@ -261,14 +323,29 @@ def Day20_Part1(input_file: str='Inputs/Day20_Inputs.txt') -> int:
     """
     # Parse input file to extract module configuration
     lines = get_input(input_file)
-    # Initialise module types, states and connections
-    modules, states, connected = extract_modules(lines)
-    # Count pulses
+    # Initialise module types, states and connections, indexed by module ID
+    _, types, states, conn, full_masks = intern_modules(*extract_modules(lines))
+    # Count pulses, tracking the counts after each push
     n_low, n_high = 0, 0
+    counts = [(n_low, n_high)]
+    # Track the number of pushes after which each state of the machine was seen
+    seen = {tuple(states): 0}
     # Push button 1000 times
-    for i in range(1000):
+    for i in range(1, 1001):
         # Update number of pulses each push
-        n_low, n_high = push_button(modules, states, connected, n_low, n_high)
+        n_low, n_high = push_button(types, states, conn, full_masks, BROADCASTER, n_low, n_high)
+        counts.append((n_low, n_high))
+        # If this state has been seen before, the pushes since then will repeat in a cycle
+        state = tuple(states)
+        if state in seen:
+            start = seen[state]
+            # Find the number of full cycles left in the 1000 pushes, and the pushes after them
+            cycles, rem = divmod(1000 - start, i - start)
+            # Add the pulses sent in each cycle to the pulses sent up to the same point in the cycle
+            n_low = counts[start + rem][0] + cycles*(n_low - counts[start][0])
+            n_high = counts[start + rem][1] + cycles*(n_high - counts[start][1])
+            break
+        seen[state] = i
 
     product = n_low*n_high
 
@@ -307,7 +384,7 @@ def graphviz_input(modules, connected):
             for connection in connected[name]:
                 print(f'{name} -> {connection}')
 
-def pushes_to_low(modules: dict, states: dict, connected: dict) -> int:
+def pushes_to_low(types: list, states: list, conn: list, full_masks: list, start: int) -> int:
     """
     Determines the number of times a button which sends a single low pulse to the broadcaster of a
     series of modules forming a loop, needs to be pushed for a single low pulse to be sent to the
@@ -317,14 +394,19 @@ def pushes_to_low(modules: dict, states: dict, connected: dict) -> int:
 
     Parameters
     ----------
-    modules : dict(str: int)
-        Dict mapping each module name onto its enumerated type.
-    states : dict(str: int or dict(str: int) or list(int))
-        Dict mapping each module name into its state, which is an int for flip-flop modules, a dict
-        mapping the name of every input module onto its remembered state for conjunction modules,
-        and a list of each input for untyped modules.
-    connected : dict(str: list(str))
-        Dict mapping the name of every module onto the names of the modules it outputs to.
+    types : list(int)
+        Enumerated type of each module, indexed by module ID.
+    states : list(int or None)
+        State of each module, indexed by module ID, which is an int for flip-flop modules, a
+        bitmask of the inputs remembered as high for conjunction modules, and 0 for untyped
+        modules, which have no state.
+    conn : list(list(tuple(int, int)))
+        Connections from each module, indexed by module ID, as the ID of the module it outputs to
+        paired with the bit of the source module in the memory of that module.
+    full_masks : list(int)
+        Bitmask with every input bit set for each conjunction module, indexed by module ID.
+    start : int
+        ID of the broadcaster module.
 
     Returns
     -------
@@ -332,106 +414,84 @@ def pushes_to_low(modules: dict, states: dict, connected: dict) -> int:
         Number of button pushes before a single low pulse is sent to the untyped module.
 
     """
-    # Find the name of the untyped module
-    end = [k for k, v in modules.items() if v == 3][0]
+    # Find the ID of the untyped module
+    end = types.index(3)
+
+    # Build the queue entry for a low and a high pulse sent by each module once, so that queueing
+    # a pulse during the pushes doesn't allocate a new entry
+    emit = [((0, edges), (1, edges)) for edges in conn]
+
+    # Start a queue of pulses, which is reused for every push
+    queue = deque()
+    # Bind the queue methods to locals for the loop
+    append, popleft = queue.append, queue.popleft
+    # The low pulses sent by the broadcaster each push
+    first = emit[start][0]
 
     n = 0
-    # Until there is a low pulse to the untyped module
-    while 0 not in states[end]:
-        # Keep pushing the button
-        push_button(modules, states, connected)
-        # Count pushes
+    # Keep pushing the button until there is a low pulse to the untyped module
+    while True:
+        # Count pushes, and send the low pulses from the broadcaster
         n += 1
+        append(first)
+        # While there are pulses left to be processed
+        while queue:
+            # Extract the oldest ones
+            pulse, edges = popleft()
+            # Process the pulse at each destination in turn
+            for mod, bit in edges:
+                # If this is a low pulse to the untyped module, we're done
+                if mod == end and pulse == 0:
+                    return n
+                m = types[mod]
+                # For flip-flop modules
+                if m == 0:
+                    # If the pulse is high do nothing, else flip the state and output the new state
+                    if pulse == 0:
+                        state = states[mod] = states[mod] ^ 1
+                        append(emit[mod][state])
+                # For conjunction modules
+                elif m == 1:
+                    # Update the bit of the source module in memory
+                    state = states[mod] = states[mod] | bit if pulse else states[mod] & ~bit
+                    # If all input states are high output low, else output high
+                    append(emit[mod][state != full_masks[mod]])
+
+def loop_frequency(loop: list) -> int:
+    """
+    Determines the number of times a button which sends a single low pulse to the broadcaster of a
+    series of modules forming a loop, needs to be pushed for a single low pulse to be sent by the
+    conjunction module at the end of the loop, without simulating the loop. The flip-flop modules
+    in the loop act as a binary counter of the pushes, so the conjunction module sends a low pulse
+    when every flip-flop which feeds into it is on for the first time.
 
-    return n
-
-### All this is just to find the lowest common multiple of two numbers ###
-                                                                         #
-def next_prime(n: int) -> int:                                           #
-    """                                                                  #
-    Finds the next highest prime number after a given integer.           #
-                                                                         #
-    Parameters                                                           #
-    ----------                                                           #
-    n : int                                                              #                                                                         #                                                                         #
-        The current number.                                              #
-                                                                         #                                                                         #                                                                         #
-    Returns                                                              #
-    -------                                                              #
-    n : int                                                              #
-        The next highest prime number after the given integer.           #
-                                                                         #
-    """                                                                  #
-    n += 1                                                               #
-    # While the number has any factors between 2 and sqrt(n), increment  #
-    while not all(n%i for i in range(2, int(n**0.5))):                   #
-        n += 1                                                           #
-                                                                         #
-    return n                                                             #
-                                                                         #
-def prime_factors(n: int) -> dict:                                       #
-    """                                                                  #
-    Finds the prime factors of a given integer.                          #
-                                                                         #
-    Parameters                                                           #
-    ----------                                                           #
-    n : int                                                              #
-        Number to find the prime factors for.                            #
-                                                                         #
-    Returns                                                              #
-    -------                                                              #
-    factors : dict(int: int)                                             #
-        Dict mapping each prime factors onto its occurence in the prime  #
-        factors of n.                                                    #
-                                                                         #
-    """                                                                  #
-    #
-    factors = dict()                                                     #
-    # Start at 2                                                         #
-    f = 2                                                                #
-    # While there are remaining factors                                  #
-    while n > 1:                                                         #
-        # Count occurances of current factor                             #
-        num = 0                                                          #
-        while n%f == 0:                                                  #
-            n /= f                                                       #
-            num += 1                                                     #
-        # Add new factor with occurance count                            #
-        if num > 0:                                                      #
-            factors[f] = num                                             #
-        # Check next highest prime number                                #
-        f = next_prime(f)                                                #
-                                                                         #
-    return factors                                                       #
-                                                                         #
-import operator                                                          #
-from functools import reduce                                             #
-                                                                         #
-def lcm(nums: list) -> int:                                              #
-    """                                                                  #
-    Find the lowest common multiple of a list of integers.               #
-                                                                         #
-    Parameters                                                           #
-    ----------                                                           #
-    nums : list(int)                                                     #
-        List of integers.                                                #
-                                                                         #
-    Returns                                                              #
-    -------                                                              #
-    lcm : int                                                            #
-        Lowest common multiple of the two integers.                      #
-                                                                         #
-    """                                                                  #
-    # Find prime factors of each number                                  #
-    p_f = [prime_factors(n) for n in nums]                               #
-    all_f = set(f for d in p_f for f in d)                               #
-    # Find maximum occurence of every prime factor occuring across all   #
-    # the numbers                                                        #
-    factors = [f**max(n[f] for n in p_f if f in n) for f in all_f]       #
-    # Find total product                                                 #
-    return reduce(operator.mul, factors, 1)                              #
-                                                                         #
-##########################################################################
+    Parameters
+    ----------
+    loop : list(tuple(str, tuple(str)))
+        Parsed lines describing the modules in the loop, in order, starting from the broadcaster
+        and ending with the conjunction module.
+
+    Returns
+    -------
+    freq : int
+        Number of button pushes before a single low pulse is sent by the conjunction module.
+
+    """
+    # Find the name of the conjunction module at the end of the loop
+    conj = loop[-1][0][1:]
+    # Track frequency of this loop
+    freq = 0
+    # For each flip-flop module in the loop, each one will send a high pulse after the button
+    # is pushed according to increasing powers of two
+    for n, (name, conn) in enumerate(loop[1:-1]):
+        # If the flip-flop is connected to the conjuction module, set the corresponding bit of
+        # the frequency
+        if conj in conn:
+            freq |= 1 << n
+
+    return freq
+
+from math import lcm
 
 @time_function
 def Day20_Part2(input_file: str='Inputs/Day20_Inputs.txt') -> int:
@@ -457,26 +517,51 @@ def Day20_Part2(input_file: str='Inputs/Day20_Inputs.txt') -> int:
     # solution is the lowest common multiple of the required pushes for each loop
     loops = get_input(input_file, split_loops=True)
 
-    # Track frequencies of low pulses from the loop
-    loop_freqs = []
-    # For each loop
-    for loop in loops:
-        # Initialise module types, states and connections for the current loop
-        modules, states, connected = extract_modules(loop)
-        # Find pushes required for a single low pulse to be sent by the conjunction module
-        loop_freq = pushes_to_low(modules, states, connected)
-        loop_freqs.append(loop_freq)
+    # Find frequencies of low pulses from each loop, from the connections of its flip-flops
+    loop_freqs = [loop_frequency(loop) for loop in loops]
 
     # Find lowest common multiple to find overall solution
-    first_rx_low = lcm(loop_freqs)
+    first_rx_low = lcm(*loop_freqs)
 
     return first_rx_low
 
+# Finding the loop frequencies from their connections was originally the fast method
+Day20_Part2_Fast = Day20_Part2
+
+def simulate_loop(loop: list) -> int:
+    """
+    Determines the number of times a button which sends a single low pulse to the broadcaster of a
+    series of modules forming a loop, needs to be pushed for a single low pulse to be sent by the
+    conjunction module at the end of the loop, by simulating the button pushes.
+
+    Parameters
+    ----------
+    loop : list(tuple(str, tuple(str)))
+        Parsed lines describing the modules in the loop, in order, starting from the broadcaster
+        and ending with the conjunction module.
+
+    Returns
+    -------
+    loop_freq : int
+        Number of button pushes before a single low pulse is sent by the conjunction module.
+
+    """
+    # Initialise module types, states and connections for the loop, indexed by ID
+    _, types, states, conn, full_masks = intern_modules(*extract_modules(loop))
+    # Find pushes required for a single low pulse to be sent by the conjunction module
+    loop_freq = pushes_to_low(types, states, conn, full_masks, BROADCASTER)
+
+    return loop_freq
+
+from concurrent.futures import ProcessPoolExecutor
+
 @time_function
-def Day20_Part2_Fast(input_file: str='Inputs/Day20_Inputs.txt') -> int:
+def Day20_Part2_Simulate(input_file: str='Inputs/Day20_Inputs.txt') -> int:
     """
     Determines the fewest number of button presses required to deliver a single low pulse to the
-    module named rx, in a series of modules whose configuration is given in an input file.
+    module named rx, in a series of modules whose configuration is given in an input file, by
+    simulating the button presses for each loop of the machine. This gives the same result as
+    Day20_Part2, which it can be used to check.
 
     Parameters
     ----------
@@ -496,25 +581,11 @@ def Day20_Part2_Fast(input_file: str='Inputs/Day20_Inputs.txt') -> int:
     # solution is the lowest common multiple of the required pushes for each loop
     loops = get_input(input_file, split_loops=True)
 
-    # Track frequencies of low pulses from the loop
-    loop_freqs = []
-    # For each loop
-    for loop in loops:
-        # Find the name of the conjunction module at the end of the loop
-        conj = loop[-1][0][1:]
-        # Track frequency of this loop
-        freq = 0
-        # For each flip-flop module in the loop, each one will send a high pulse after the button
-        # is pushed according to increasing powers of two
-        for n, (name, conn) in enumerate(loop[1:-1]):
-            # If the flip-flop is connected to the conjuction module, add the corresponding power
-            # of two to the frequency
-            if conj in conn:
-                freq += (2**n)
-
-        loop_freqs.append(freq)
+    # Each loop is independent, so simulate the loops in parallel across multiple processes
+    with ProcessPoolExecutor(max_workers=len(loops)) as pool:
+        loop_freqs = list(pool.map(simulate_loop, loops))
 
     # Find lowest common multiple to find overall solution
-    first_rx_low = lcm(loop_freqs)
+    first_rx_low = lcm(*loop_freqs)
 
     return first_rx_low